@@ -1,19 +1,42 @@
 import maya.cmds as cmds
+import maya.api.OpenMaya as om
 import math
 
+from node_registry import REGISTRY
+
 #  Keyframe Utility
 def key(obj, attr, value, frame, offset=0):
     """Shortcut wrapper for setKeyframe"""
     cmds.setKeyframe(obj, at=attr, t=frame + offset, v=value)
 
 
+#  재질 유틸 (호버카/택시/건물 빌더가 모두 사용 → 빌더보다 먼저 정의)
+# 존재 확인/연결/할당은 REGISTRY 핸들로 (이름 검색 반복 안 함)
+def make_shader(shader_type, name):
+    # 중복 이름 방지: 이미 있으면 재사용
+    if REGISTRY.exists(name):
+        return name
+    return REGISTRY.register(cmds.shadingNode(shader_type, asShader=True, name=name))
+
+def make_sg(shader_name):
+    sg = shader_name + "_SG"
+    if REGISTRY.exists(sg):
+        return sg
+    sg = REGISTRY.register(cmds.sets(renderable=True, noSurfaceShader=True, empty=True, name=sg))
+    REGISTRY.connect(shader_name, "outColor", sg, "surfaceShader", force=True)
+    return sg
+
+def assign(obj_list, shader_name):
+    REGISTRY.assign(obj_list, make_sg(shader_name))
+
+
 #  HoverCar 생성 함수
 def create_hovercar_v9_1(name="HoverCar"):
     """호버카 모델을 생성하고 재질을 적용하여 하나의 그룹으로 반환"""
 
     # 중복 방지
-    if cmds.objExists(name):
-        cmds.delete(name)
+    if REGISTRY.exists(name):
+        cmds.delete(REGISTRY.path(name))
 
     root = cmds.group(em=True, name=name)
 
@@ -102,16 +125,11 @@ def create_hovercar_v9_1(name="HoverCar"):
     cmds.setAttr(glow + ".color", 0.1, 0.8, 1.0, type="double3")
     cmds.setAttr(glow + ".incandescence", 0.2, 0.9, 1.0, type="double3")
 
-    # 재질 적용 함수
-    def apply(mat, objs):
-        sg = cmds.sets(renderable=True, noSurfaceShader=True, empty=True, name=mat + "_SG")
-        cmds.connectAttr(mat + ".outColor", sg + ".surfaceShader")
-        cmds.sets(objs, e=True, forceElement=sg)
-
-    apply(hull, [body])
-    apply(glass, [canopy])
-    apply(metal, engines)
-    apply(glow, pads + glow_materials)
+    # 재질 적용 (SG 이름은 <재질>_SG)
+    assign([body], hull)
+    assign([canopy], glass)
+    assign(engines, metal)
+    assign(pads + glow_materials, glow)
 
     cmds.xform(root, centerPivots=True)
 
@@ -119,85 +137,75 @@ def create_hovercar_v9_1(name="HoverCar"):
 
 
 #  Animation Functions
+#  키 데이터 계산(cmds 없음)과 키 찍기를 분리 → build_pipeline 에서 계산만 워커로 돌림
+UAM_PATHS = {
+    # (start 기준 프레임, 없으면 end), (x, y, z)
+    "A": [(0, (-10, 2, -8)), (200, (-2, 3.5, -1)), (400, (6, 4.5, 3)), (None, (10, 5, 6))],
+    "B": [(0, (12, 10, 8)), (200, (6, 12, 2)), (400, (-2, 13, -2)), (None, (-10, 14, -6))],
+    "C": [(0, (8, 15, -10)), (150, (4, 16, -3)), (350, (-1, 17, 4)), (None, (-8, 17, 10))],
+}
+
+def hover_and_liftoff_keys(baseY, start=1, hoverEnd=60, liftEnd=100):
+    """[(attr, frame, value)]"""
+    keys = [("translateY", f, baseY + 0.2 * math.sin(f * 0.2))
+            for f in range(start, hoverEnd + 1, 5)]
+    keys.append(("translateY", liftEnd, baseY + 1.5))
+    return keys
+
+def uam_path_keys(path, start, end, offset=0):
+    """[(attr, frame, value)]"""
+    keys = []
+    for df, xyz in UAM_PATHS[path]:
+        f = end if df is None else start + df
+        for attr, v in zip(("translateX", "translateY", "translateZ"), xyz):
+            keys.append((attr, f + offset, v))
+    return keys
+
+def engine_glow_keys(start=1, end=600, offset=0):
+    """[(attr, frame, value)]"""
+    keys = []
+    for f in range(start, end+1, 40):
+        glow = (math.sin((f + offset) * 0.1) + 1) * 0.3
+        keys += [("incandescenceR", f, glow),
+                 ("incandescenceG", f, glow),
+                 ("incandescenceB", f, 1.0)]
+    return keys
+
+
 # Hover + Lift Off
 def animate_hover_and_liftoff(root, start=1, hoverEnd=60, liftEnd=100):
     baseY = cmds.getAttr(root + ".translateY")
 
-    # Hover sine wave
-    for f in range(start, hoverEnd + 1, 5):
-        y = baseY + 0.2 * math.sin(f * 0.2)
-        key(root, "translateY", y, f)
-
-    # Lift upward
-    key(root, "translateY", baseY + 1.5, liftEnd)
+    # Hover sine wave + Lift upward
+    for attr, f, v in hover_and_liftoff_keys(baseY, start, hoverEnd, liftEnd):
+        key(root, attr, v, f)
 
 
 # Path A
 def animate_uam_path_A(root, start=100, end=600, offset=0):
-    key(root, "translateX", -10, start, offset)
-    key(root, "translateY", 2, start, offset)
-    key(root, "translateZ", -8, start, offset)
-
-    key(root, "translateX", -2, start+200, offset)
-    key(root, "translateY", 3.5, start+200, offset)
-    key(root, "translateZ", -1, start+200, offset)
-
-    key(root, "translateX", 6, start+400, offset)
-    key(root, "translateY", 4.5, start+400, offset)
-    key(root, "translateZ", 3, start+400, offset)
-
-    key(root, "translateX", 10, end, offset)
-    key(root, "translateY", 5, end, offset)
-    key(root, "translateZ", 6, end, offset)
+    for attr, f, v in uam_path_keys("A", start, end, offset):
+        key(root, attr, v, f)
 
 
 # Path B
 def animate_uam_path_B(root, start=1, end=600, offset=0):
-    key(root, "translateX", 12, start, offset)
-    key(root, "translateY", 10, start, offset)
-    key(root, "translateZ", 8, start, offset)
-
-    key(root, "translateX", 6, start+200, offset)
-    key(root, "translateY", 12, start+200, offset)
-    key(root, "translateZ", 2, start+200, offset)
-
-    key(root, "translateX", -2, start+400, offset)
-    key(root, "translateY", 13, start+400, offset)
-    key(root, "translateZ", -2, start+400, offset)
-
-    key(root, "translateX", -10, end, offset)
-    key(root, "translateY", 14, end, offset)
-    key(root, "translateZ", -6, end, offset)
+    for attr, f, v in uam_path_keys("B", start, end, offset):
+        key(root, attr, v, f)
 
 
 # Path C
 def animate_uam_path_C(root, start=1, end=600, offset=0):
-    key(root, "translateX", 8, start, offset)
-    key(root, "translateY", 15, start, offset)
-    key(root, "translateZ", -10, start, offset)
-
-    key(root, "translateX", 4, start+150, offset)
-    key(root, "translateY", 16, start+150, offset)
-    key(root, "translateZ", -3, start+150, offset)
-
-    key(root, "translateX", -1, start+350, offset)
-    key(root, "translateY", 17, start+350, offset)
-    key(root, "translateZ", 4, start+350, offset)
-
-    key(root, "translateX", -8, end, offset)
-    key(root, "translateY", 17, end, offset)
-    key(root, "translateZ", 10, end, offset)
+    for attr, f, v in uam_path_keys("C", start, end, offset):
+        key(root, attr, v, f)
 
 
 # Engine Glow Animation
 def animate_engine_glow(glow_list, start=1, end=600, offset=0):
     """sin 기반 발광 변화"""
-    for f in range(start, end+1, 40):
-        glow = (math.sin((f + offset) * 0.1) + 1) * 0.3
-        for g in glow_list:
-            key(g, "incandescenceR", glow, f)
-            key(g, "incandescenceG", glow, f)
-            key(g, "incandescenceB", 1.0, f)
+    keys = engine_glow_keys(start, end, offset)
+    for g in glow_list:
+        for attr, f, v in keys:
+            key(g, attr, v, f)
 
 
 #  애니메이션 후처리 
@@ -221,6 +229,49 @@ def slow_down_motion(obj, time_range=(1,600), scale=1.3):
                   timePivot=time_range[0])
 
 
+#  오브젝트별 색: 메쉬 colorSet 에 저장하고 공용 셰이더가 읽음 (create_building 보다 먼저 정의)
+#  - 뷰포트: 정점 색 표시 / Arnold: aiUserDataColor 가 같은 colorSet 을 읽음
+#    (shape 의 aiExportColors 를 켜야 MtoA 가 colorSet 을 내보냄)
+#  - 그 밖의 렌더러(Maya Software / Hardware 2.0 렌더)는 colorSet 을 안 읽어서
+#    모든 건물이 공용 셰이더 기본색(default) 한 가지로 나옴 → render_scheduler 는 Arnold 로 렌더
+OBJ_COLOR_SET = "objColor"
+
+def shared_color_shader(name, default=(1, 1, 1)):
+    """오브젝트 색을 읽는 공용 lambert (오브젝트 수와 상관없이 하나)"""
+    if REGISTRY.exists(name):
+        return name
+    mat = make_shader("lambert", name)
+    REGISTRY.set(mat, "color", *default)
+    if not cmds.pluginInfo("mtoa", q=True, loaded=True):
+        # 빌드 시점에 Arnold 가 안 켜져 있어도 설치돼 있으면 로드해서 연결
+        try:
+            cmds.loadPlugin("mtoa", quiet=True)
+        except RuntimeError:
+            pass
+    if cmds.pluginInfo("mtoa", q=True, loaded=True):
+        data = cmds.shadingNode("aiUserDataColor", asUtility=True, name=name + "_objColor")
+        cmds.setAttr(data + ".attribute", OBJ_COLOR_SET, type="string")
+        cmds.setAttr(data + ".default", *default, type="double3")
+        cmds.connectAttr(data + ".outColor", mat + ".color", f=True)
+    return mat
+
+def set_object_color(obj, color):
+    """메쉬 전체 정점에 objColor 색 기록 (history 는 지움)"""
+    cmds.delete(obj, ch=True)
+    sel = om.MSelectionList()
+    sel.add(obj)
+    fn = om.MFnMesh(sel.getDagPath(0).extendToShape())
+    if OBJ_COLOR_SET not in fn.getColorSetNames():
+        fn.createColorSet(OBJ_COLOR_SET, False)
+    fn.setCurrentColorSetName(OBJ_COLOR_SET)
+    n = fn.numVertices
+    fn.setVertexColors([om.MColor(color)] * n, list(range(n)))
+    shape = fn.fullPathName()
+    cmds.setAttr(shape + ".displayColors", 1)
+    if cmds.pluginInfo("mtoa", q=True, loaded=True):
+        cmds.setAttr(shape + ".aiExportColors", 1)
+
+
 #  도시 환경 생성
 def create_material(name, color):
     mat = cmds.shadingNode("lambert", asShader=True, name=name+"_Mat")
@@ -229,10 +280,12 @@ def create_material(name, color):
     cmds.connectAttr(mat+".outColor", sg+".surfaceShader")
     return sg
 
-def create_building(name, x, z, h=12, w=8, d=8):
+def create_building(name, x, z, h=12, w=8, d=8, color=(0.82,0.88,0.96)):
     bld, _ = cmds.polyCube(w=w, d=d, h=h, name=name)
     cmds.move(x, h/2, z)
-    cmds.sets(bld, e=True, forceElement=create_material(name, (0.82,0.88,0.96)))
+    # 건물마다 재질을 만들지 않고 공용 셰이더 + 오브젝트 색
+    assign(bld, shared_color_shader("Building_Facade_mat", color))
+    set_object_color(bld, color)
     return bld
 
 def create_tree(name, x, z):
@@ -347,9 +400,9 @@ def create_flying_taxi():
     light_mat = cmds.shadingNode("lambert", asShader=True, name="light_mat")
     cmds.setAttr(light_mat + ".color", 1.0, 1.0, 0.9, type="double3")
 
-    cmds.select(body, roof); cmds.hyperShade(assign=body_mat)
-    cmds.select(glass); cmds.hyperShade(assign=glass_mat)
-    cmds.select(light_L, light_R); cmds.hyperShade(assign=light_mat)
+    assign([body, roof], body_mat)
+    assign(glass, glass_mat)
+    assign([light_L, light_R], light_mat)
 
     # 프로펠러 회전
     expr = """
@@ -363,26 +416,22 @@ rotor_RR_grp.rotateY = time * 60;
     return taxi_grp
 
 
-def animate_taxi(taxi_grp):
-    cmds.cutKey(taxi_grp, time=(1,240))  # 혹시 이전 키 있으면 삭제
+TAXI_PATH = [(1, (-15, 8, -5, 15)), (100, (0, 12, 0, 40)), (200, (15, 16, 3, 70))]
 
-    cmds.currentTime(1)
-    cmds.setKeyframe(taxi_grp, at="translateX", v=-15)
-    cmds.setKeyframe(taxi_grp, at="translateY", v=8)
-    cmds.setKeyframe(taxi_grp, at="translateZ", v=-5)
-    cmds.setKeyframe(taxi_grp, at="rotateY", v=15)
+def taxi_keys(offset=0, end=None):
+    """[(attr, frame, value)] — end 를 주면 마지막(착륙) 키를 end 프레임에 (마지막 구간이 늘어남)"""
+    keys = []
+    for f, vals in TAXI_PATH:
+        frame = end if end is not None and f == TAXI_PATH[-1][0] else f + offset
+        for attr, v in zip(("translateX", "translateY", "translateZ", "rotateY"), vals):
+            keys.append((attr, frame, v))
+    return keys
 
-    cmds.currentTime(100)
-    cmds.setKeyframe(taxi_grp, at="translateX", v=0)
-    cmds.setKeyframe(taxi_grp, at="translateY", v=12)
-    cmds.setKeyframe(taxi_grp, at="translateZ", v=0)
-    cmds.setKeyframe(taxi_grp, at="rotateY", v=40)
+def animate_taxi(taxi_grp, offset=0):
+    cmds.cutKey(taxi_grp, time=(1 + offset, 240 + offset))  # 혹시 이전 키 있으면 삭제
 
-    cmds.currentTime(200)
-    cmds.setKeyframe(taxi_grp, at="translateX", v=15)
-    cmds.setKeyframe(taxi_grp, at="translateY", v=16)
-    cmds.setKeyframe(taxi_grp, at="translateZ", v=3)
-    cmds.setKeyframe(taxi_grp, at="rotateY", v=70)
+    for attr, f, v in taxi_keys(offset):
+        key(taxi_grp, attr, v, f)
 
     cmds.selectKey(taxi_grp)
     cmds.keyTangent(itt="spline", ott="spline")
@@ -391,45 +440,46 @@ def animate_taxi(taxi_grp):
 # -----------------------------
 # 실행 영역
 # -----------------------------
-create_city_environment()
+if __name__ == "__main__":
+    create_city_environment()
 
-vehicles=[]
-glow_groups=[]
+    vehicles=[]
+    glow_groups=[]
 
-for i,pos in enumerate([(0,2,0),(-6,2,-4),(6,2,4)]):
-    name=f"HoverCar_{i+1}"
-    root,glows=create_hovercar_v9_1(name)
-    cmds.xform(root,ws=True,t=pos)
-    cmds.rotate(0,(i*15)-10,0,root)
-    vehicles.append(root)
-    glow_groups.append(glows)
+    for i,pos in enumerate([(0,2,0),(-6,2,-4),(6,2,4)]):
+        name=f"HoverCar_{i+1}"
+        root,glows=create_hovercar_v9_1(name)
+        cmds.xform(root,ws=True,t=pos)
+        cmds.rotate(0,(i*15)-10,0,root)
+        vehicles.append(root)
+        glow_groups.append(glows)
 
-v1,v2,v3 = vehicles
+    v1,v2,v3 = vehicles
 
-animate_hover_and_liftoff(v1)
-animate_uam_path_A(v1)
-animate_uam_path_B(v2, offset=20)
-animate_uam_path_C(v3, offset=40)
+    animate_hover_and_liftoff(v1)
+    animate_uam_path_A(v1)
+    animate_uam_path_B(v2, offset=20)
+    animate_uam_path_C(v3, offset=40)
 
-for i,glows in enumerate(glow_groups):
-    animate_engine_glow(glows, offset=i*15)
+    for i,glows in enumerate(glow_groups):
+        animate_engine_glow(glows, offset=i*15)
 
-# After animation: 과제에서 요구한 애니메이션 개념 적용
-exaggerate_hover(v1, amount=0.25)
-clean_hover_spike(v1)
+    # After animation: 과제에서 요구한 애니메이션 개념 적용
+    exaggerate_hover(v1, amount=0.25)
+    clean_hover_spike(v1)
 
-smooth_motion_curve(v1,"translateX",(100,600))
-smooth_motion_curve(v2,"translateX",(1,600))
-smooth_motion_curve(v3,"translateZ",(1,600))
+    smooth_motion_curve(v1,"translateX",(100,600))
+    smooth_motion_curve(v2,"translateX",(1,600))
+    smooth_motion_curve(v3,"translateZ",(1,600))
 
-slow_down_motion(v3,(1,600),scale=1.3)
+    slow_down_motion(v3,(1,600),scale=1.3)
 
-print_key_info(v1,"translateX")
+    print_key_info(v1,"translateX")
 
-# === Taxi 생성 & 애니메이션 추가 ===
-taxi = create_flying_taxi()
-cmds.xform(taxi, ws=True, t=(0, 10, 0))  # 도시 위쪽에 배치
-animate_taxi(taxi)
+    # === Taxi 생성 & 애니메이션 추가 ===
+    taxi = create_flying_taxi()
+    cmds.xform(taxi, ws=True, t=(0, 10, 0))  # 도시 위쪽에 배치
+    animate_taxi(taxi)
 
 
 # =========================================================
@@ -439,26 +489,6 @@ animate_taxi(taxi)
 import random
 random.seed(7)
 
-def make_shader(shader_type, name):
-    # 중복 이름 방지: 이미 있으면 재사용
-    if cmds.objExists(name):
-        return name
-    return cmds.shadingNode(shader_type, asShader=True, name=name)
-
-def make_sg(shader_name):
-    sg = shader_name + "_SG"
-    if cmds.objExists(sg):
-        return sg
-    sg = cmds.sets(renderable=True, noSurfaceShader=True, empty=True, name=sg)
-    cmds.connectAttr(shader_name + ".outColor", sg + ".surfaceShader", f=True)
-    return sg
-
-def assign(obj_list, shader_name):
-    if not isinstance(obj_list, (list, tuple)):
-        obj_list = [obj_list]
-    sg = make_sg(shader_name)
-    cmds.sets(obj_list, e=True, forceElement=sg)
-
 def add_road_and_sidewalk():
     extra = cmds.group(em=True, name="CityExtra_grp")
 
@@ -534,36 +564,50 @@ def add_streetlights_row(x_from=-18, x_to=18, step=8, zA=6.2, zB=-6.2):
         cmds.parent(a, b, lights_grp)
     return lights_grp
 
-def add_extra_buildings():
+EXTRA_BUILDING_COORDS = [(-22, 14), (-12, 18), (0, 20), (12, 18), (22, 14),
+                         (-22, -14), (22, -14)]
+
+def plan_extra_buildings(rng=random, coords=EXTRA_BUILDING_COORDS):
+    """건물 크기/색/창문 여부만 계산 (cmds 없음) → [dict]"""
+    plan = []
+    for x, z in coords:
+        h = rng.uniform(10, 20)
+        w = rng.uniform(6, 9)
+        d = rng.uniform(6, 9)
+        base = 0.55 + rng.random()*0.25
+        plan.append(dict(x=x, z=z, h=h, w=w, d=d, base=base,
+                         window=rng.random() < 0.8))
+    return plan
+
+def add_extra_buildings(plan=None):
     bgrp = cmds.group(em=True, name="BuildingsExtra_grp")
 
     # 도로 바깥쪽에만 살짝 추가(과하지 않게)
-    coords = [(-22, 14), (-12, 18), (0, 20), (12, 18), (22, 14),
-              (-22, -14), (22, -14)]
-    for i, (x, z) in enumerate(coords, start=1):
-        h = random.uniform(10, 20)
-        w = random.uniform(6, 9)
-        d = random.uniform(6, 9)
+    if plan is None:
+        plan = plan_extra_buildings()
+
+    for i, p in enumerate(plan, start=1):
+        x, z, h, w, d = p["x"], p["z"], p["h"], p["w"], p["d"]
 
         b, _ = cmds.polyCube(w=w, d=d, h=h, name=f"ExtraBuilding_{i}_geo")
         cmds.move(x, h/2, z)
 
-        # “차가운” 건물 색감 + 약간 변주
-        mat = make_shader("lambert", f"ExtraBuilding_{i}_mat")
-        base = 0.55 + random.random()*0.25
-        cmds.setAttr(mat + ".color", base, base + 0.05, base + 0.12, type="double3")
-        assign(b, mat)
+        # “차가운” 건물 색감 + 약간 변주 (공용 재질 하나, 색은 오브젝트별)
+        base = p["base"]
+        assign(b, shared_color_shader("ExtraBuilding_Facade_mat", (0.67, 0.72, 0.79)))
+        set_object_color(b, (base, base + 0.05, base + 0.12))
 
         # 야경 창문(한 면만, 과하지 않게)
-        if random.random() < 0.8:
+        if p["window"]:
             win, _ = cmds.polyPlane(w=w*0.6, h=h*0.5, name=f"ExtraBuilding_{i}_win_geo")
             cmds.move(x + w/2 + 0.01, h*0.55, z, win)
             cmds.rotate(0, 90, 0, win)
 
-            wmat = make_shader("lambert", f"ExtraBuilding_{i}_win_mat")
-            cmds.setAttr(wmat + ".color", 0.25, 0.8, 1.0, type="double3")
-            cmds.setAttr(wmat + ".incandescence", 0.25, 0.8, 1.0, type="double3")
-            assign(win, wmat)
+            if not REGISTRY.exists("ExtraBuilding_Window_mat"):
+                wmat = make_shader("lambert", "ExtraBuilding_Window_mat")
+                cmds.setAttr(wmat + ".color", 0.25, 0.8, 1.0, type="double3")
+                cmds.setAttr(wmat + ".incandescence", 0.25, 0.8, 1.0, type="double3")
+            assign(win, "ExtraBuilding_Window_mat")
 
             cmds.parent(win, bgrp)
 
@@ -598,16 +642,17 @@ def add_skydome_night():
 # -------------------------
 # 실행(추가)
 # -------------------------
-# 1) 도로/인도 추가(색감 안정)
-extra_grp = add_road_and_sidewalk()
+if __name__ == "__main__":
+    # 1) 도로/인도 추가(색감 안정)
+    extra_grp = add_road_and_sidewalk()
 
-# 2) 가로등 추가(요청 포인트)
-lights = add_streetlights_row(step=8)
-cmds.parent(lights, extra_grp)
+    # 2) 가로등 추가(요청 포인트)
+    lights = add_streetlights_row(step=8)
+    cmds.parent(lights, extra_grp)
 
-# 3) 건물 조금 더 추가(과하지 않게 외곽만)
-bld = add_extra_buildings()
-cmds.parent(bld, extra_grp)
+    # 3) 건물 조금 더 추가(과하지 않게 외곽만)
+    bld = add_extra_buildings()
+    cmds.parent(bld, extra_grp)
 
-# 4) 야경 하늘(선택 느낌)
-add_skydome_night()
+    # 4) 야경 하늘(선택 느낌)
+    add_skydome_night()
@@ -0,0 +1,352 @@
+import heapq
+import math
+import numpy as np
+
+#  복셀 공역 맵 + 경로 계획
+#  - 환경 빌더가 만든 건물/가로등/나무 메쉬의 면별 바운딩 박스 → 3D 점유 격자 (numpy bool)
+#  - 고도 레이어마다 2D 장애물 맵 (레이어 고도 ± clearance 슬랩에 뭔가 있으면 막힘)
+#  - A* (8방향, 모서리 끼어가기 금지) + 버티포트별 거리장(Dijkstra)/흐름장 캐시
+#    → 버티포트로 가는 경로는 흐름장 따라가기만 하면 되므로 수천 건/초
+#  - 결과는 FI.py 키 형식 [(attr, frame, value)] 로 변환 가능
+
+# 장애물로 볼 씬 오브젝트 (FI.py 환경 빌더 이름 규칙, 정적 지오메트리만 —
+# 택시/호버카처럼 움직이는 차량은 현재 프레임 위치가 영구 장애물로 굳으므로 넣지 않음)
+OBSTACLE_PATTERNS = ["Building_*", "ExtraBuilding_*_geo", "Tree_*",
+                     "ExtraStreetLight*_grp"]
+
+NEIGHBORS = [(1, 0, 1.0), (-1, 0, 1.0), (0, 1, 1.0), (0, -1, 1.0),
+             (1, 1, math.sqrt(2)), (1, -1, math.sqrt(2)),
+             (-1, 1, math.sqrt(2)), (-1, -1, math.sqrt(2))]
+
+
+def face_boxes(points, counts, indices):
+    """메쉬 면마다 (xmin, ymin, zmin, xmax, ymax, zmax) 배열 (m, 6)
+
+    points: (n, 3) 정점 좌표, counts/indices: MFnMesh.getVertices() 형식
+    (면별 정점 수, 면 정점 인덱스를 이어 붙인 것)
+    """
+    counts = np.asarray(counts, dtype=int)
+    if not len(counts):
+        return np.empty((0, 6))
+    p = np.asarray(points, dtype=float).reshape(-1, 3)[np.asarray(indices, dtype=int)]
+    start = np.r_[0, np.cumsum(counts)[:-1]]
+    return np.hstack([np.minimum.reduceat(p, start), np.maximum.reduceat(p, start)])
+
+
+class AirspaceMap(object):
+    """축 정렬 3D 점유 격자. occ[ix, iy, iz] == True 면 막힘"""
+
+    def __init__(self, origin, shape, cell=1.0):
+        self.origin = np.asarray(origin, dtype=float)
+        self.cell = float(cell)
+        self.occ = np.zeros(shape, dtype=bool)
+
+    @classmethod
+    def from_boxes(cls, boxes, cell=1.0, margin=0.5, pad=6.0, ceiling=30.0):
+        """boxes: [(xmin, ymin, zmin, xmax, ymax, zmax)] (exactWorldBoundingBox 형식)"""
+        b = np.asarray(boxes, dtype=float).reshape(-1, 6)
+        lo = np.r_[b[:, [0, 2]].min(axis=0) - pad] if len(b) else np.array([-pad, -pad])
+        hi = np.r_[b[:, [3, 5]].max(axis=0) + pad] if len(b) else np.array([pad, pad])
+        origin = (lo[0], 0.0, lo[1])
+        shape = (int(math.ceil((hi[0] - lo[0]) / cell)),
+                 int(math.ceil(ceiling / cell)),
+                 int(math.ceil((hi[1] - lo[1]) / cell)))
+
+        amap = cls(origin, shape, cell)
+        for box in b:
+            amap.add_box(box[:3] - margin, box[3:] + margin)
+        return amap
+
+    @classmethod
+    def from_scene(cls, patterns=OBSTACLE_PATTERNS, **kwargs):
+        """패턴에 맞는 트랜스폼 아래 메쉬를 면 단위 박스로 복셀화
+
+        scene_optimizer 로 합친 메쉬(Building_Facade_mat_merged_geo 등)는 트랜스폼
+        하나가 도시 전체에 걸쳐 있어서, 트랜스폼 바운딩 박스로 막으면 공역이 통째로 막힌다.
+        """
+        import maya.cmds as cmds
+        import maya.api.OpenMaya as om
+
+        shapes = set()
+        for pat in patterns:
+            for node in cmds.ls(pat, type="transform", long=True) or []:
+                meshes = cmds.listRelatives(node, allDescendents=True, type="mesh",
+                                            fullPath=True) or []
+                shapes.update(cmds.ls(meshes, noIntermediate=True, long=True) or [])
+
+        boxes = [np.empty((0, 6))]
+        for shape in sorted(shapes):
+            sel = om.MSelectionList()
+            sel.add(shape)
+            fn = om.MFnMesh(sel.getDagPath(0))
+            pts = fn.getPoints(om.MSpace.kWorld)
+            counts, indices = fn.getVertices()
+            boxes.append(face_boxes([(p.x, p.y, p.z) for p in pts], counts, indices))
+        return cls.from_boxes(np.concatenate(boxes), **kwargs)
+
+    def add_box(self, bmin, bmax):
+        i0 = np.floor((np.asarray(bmin) - self.origin) / self.cell).astype(int)
+        i1 = np.ceil((np.asarray(bmax) - self.origin) / self.cell).astype(int)
+        i0 = np.clip(i0, 0, self.occ.shape)
+        i1 = np.clip(i1, 0, self.occ.shape)
+        self.occ[i0[0]:i1[0], i0[1]:i1[1], i0[2]:i1[2]] = True
+
+    def to_grid(self, p):
+        """월드 (x, z) → 격자 연속 좌표 (칸 ix 는 [ix, ix + 1) 구간)"""
+        return ((p[0] - self.origin[0]) / self.cell, (p[-1] - self.origin[2]) / self.cell)
+
+    def cell_of(self, p):
+        """월드 (x, z) → 격자 (ix, iz)"""
+        return (int((p[0] - self.origin[0]) // self.cell),
+                int((p[-1] - self.origin[2]) // self.cell))
+
+    def world_of(self, ix, iz, y):
+        return (float(self.origin[0] + (ix + 0.5) * self.cell), y,
+                float(self.origin[2] + (iz + 0.5) * self.cell))
+
+    def layer(self, altitude, clearance=1.0):
+        """고도 altitude 에서 비행할 때 막힌 칸 (nx, nz)"""
+        y0 = max(int((altitude - clearance) // self.cell), 0)
+        y1 = min(int((altitude + clearance) // self.cell) + 1, self.occ.shape[1])
+        return self.occ[:, y0:y1, :].any(axis=1)
+
+    def column_clear(self, ix, iz, y_from, y_to):
+        """수직 이착륙 구간이 비어 있는지"""
+        lo, hi = sorted((y_from, y_to))
+        y0 = max(int(lo // self.cell), 0)
+        y1 = min(int(hi // self.cell) + 1, self.occ.shape[1])
+        return not self.occ[ix, y0:y1, iz].any()
+
+
+class RoutePlanner(object):
+    """고도 레이어별 2D 경로 계획 (A* / 거리장)"""
+
+    def __init__(self, amap, layers=(6.0, 10.0, 14.0, 18.0), clearance=1.0):
+        self.map = amap
+        self.layers = list(layers)
+        self.blocked = {alt: amap.layer(alt, clearance) for alt in self.layers}
+        self._fields = {}
+        self._flows = {}
+        self._routes = {}
+
+    # ---------- 탐색 ----------
+    def _free(self, grid, ix, iz):
+        return 0 <= ix < grid.shape[0] and 0 <= iz < grid.shape[1] and not grid[ix, iz]
+
+    def _steps(self, grid, ix, iz):
+        for dx, dz, cost in NEIGHBORS:
+            nx, nz = ix + dx, iz + dz
+            if not self._free(grid, nx, nz):
+                continue
+            # 대각선은 양쪽 직선 칸이 모두 비어야 함
+            if dx and dz and (grid[ix + dx, iz] or grid[ix, iz + dz]):
+                continue
+            yield nx, nz, cost
+
+    def astar(self, altitude, start, goal):
+        """격자 칸 start → goal 경로 [(ix, iz)] (없으면 None)"""
+        grid = self.blocked[altitude]
+        if not (self._free(grid, *start) and self._free(grid, *goal)):
+            return None
+
+        def h(c):
+            dx, dz = abs(c[0] - goal[0]), abs(c[1] - goal[1])
+            return max(dx, dz) + (math.sqrt(2) - 1) * min(dx, dz)
+
+        g = {start: 0.0}
+        came = {}
+        heap = [(h(start), start)]
+        while heap:
+            _, cur = heapq.heappop(heap)
+            if cur == goal:
+                path = [cur]
+                while cur in came:
+                    cur = came[cur]
+                    path.append(cur)
+                return path[::-1]
+            for nx, nz, cost in self._steps(grid, *cur):
+                ng = g[cur] + cost
+                if ng < g.get((nx, nz), float("inf")):
+                    g[(nx, nz)] = ng
+                    came[(nx, nz)] = cur
+                    heapq.heappush(heap, (ng + h((nx, nz)), (nx, nz)))
+        return None
+
+    def distance_field(self, altitude, goal):
+        """goal 칸까지의 최단 거리 배열 (Dijkstra, 레이어/목표별 캐시)"""
+        key = (altitude, goal)
+        if key in self._fields:
+            return self._fields[key]
+
+        grid = self.blocked[altitude]
+        dist = np.full(grid.shape, np.inf)
+        if self._free(grid, *goal):
+            dist[goal] = 0.0
+            heap = [(0.0, goal)]
+            while heap:
+                d, (ix, iz) = heapq.heappop(heap)
+                if d > dist[ix, iz]:
+                    continue
+                for nx, nz, cost in self._steps(grid, ix, iz):
+                    nd = d + cost
+                    if nd < dist[nx, nz]:
+                        dist[nx, nz] = nd
+                        heapq.heappush(heap, (nd, (nx, nz)))
+        self._fields[key] = dist
+        return dist
+
+    def flow_field(self, altitude, goal):
+        """칸마다 goal 쪽으로 가는 다음 이동 방향 (NEIGHBORS 인덱스, 중첩 리스트)
+
+        거리장에서 numpy 로 한 번에 계산해 두면 경로 추출은 포인터 따라가기뿐이다.
+        """
+        key = (altitude, goal)
+        if key in self._flows:
+            return self._flows[key]
+
+        dist = self.distance_field(altitude, goal)
+        grid = self.blocked[altitude]
+        nx, nz = dist.shape
+        dpad = np.full((nx + 2, nz + 2), np.inf)
+        dpad[1:-1, 1:-1] = dist
+        bpad = np.ones((nx + 2, nz + 2), dtype=bool)
+        bpad[1:-1, 1:-1] = grid
+
+        cand = []
+        for dx, dz, cost in NEIGHBORS:
+            d = dpad[1 + dx:1 + dx + nx, 1 + dz:1 + dz + nz] + cost
+            if dx and dz:
+                cut = bpad[1 + dx:1 + dx + nx, 1:-1] | bpad[1:-1, 1 + dz:1 + dz + nz]
+                d = np.where(cut, np.inf, d)
+            cand.append(d)
+
+        flow = (np.argmin(np.stack(cand), axis=0).tolist(), np.isfinite(dist).tolist())
+        self._flows[key] = flow
+        return flow
+
+    def precompute(self, vertiports):
+        """버티포트 [(x, y, z)] 마다 모든 레이어의 거리장/흐름장을 미리 계산"""
+        for alt in self.layers:
+            for p in vertiports:
+                self.flow_field(alt, self.map.cell_of(p))
+
+    def _descend(self, altitude, start, goal):
+        step, reachable = self.flow_field(altitude, goal)
+        if not reachable[start[0]][start[1]]:
+            return None
+        path = [start]
+        ix, iz = start
+        while (ix, iz) != goal:
+            dx, dz, _ = NEIGHBORS[step[ix][iz]]
+            ix, iz = ix + dx, iz + dz
+            path.append((ix, iz))
+        return path
+
+    # ---------- 후처리 ----------
+    def simplify(self, altitude, pts):
+        """pts: (n, 2) 격자 연속 좌표 → 직선으로 이어도 안 막히는 점은 건너뛴 인덱스
+
+        기준점마다 뒤쪽 후보 전체의 시야 검사를 numpy 한 번으로 처리하고
+        가장 먼 보이는 점으로 점프한다. (칸당 8샘플, 장애물은 margin 만큼 부풀려 둠)
+        """
+        grid = self.blocked[altitude]
+        keep = [0]
+        i = 0
+        while i < len(pts) - 1:
+            cand = pts[i + 2:]
+            j = i + 1
+            if len(cand):
+                k = int(np.abs(cand - pts[i]).max() * 8) + 2
+                t = np.linspace(0.0, 1.0, k)[None, :, None]
+                idx = np.floor(pts[i] + (cand - pts[i])[:, None, :] * t).astype(int)
+                visible = np.flatnonzero(~grid[idx[..., 0], idx[..., 1]].any(axis=1))
+                if len(visible):
+                    j = i + 2 + visible[-1]
+            keep.append(j)
+            i = j
+        return keep
+
+    # ---------- 공개 API ----------
+    def nearest_layer(self, altitude):
+        return min(self.layers, key=lambda a: abs(a - altitude))
+
+    def route(self, start, goal, altitude=None):
+        """버티포트 start → goal (월드 좌표) 무충돌 웨이포인트 [(x, y, z)]
+
+        start/goal 고도에서 수직 상승 → 레이어 순항 → 수직 하강.
+        goal 이 precompute 된 버티포트면 흐름장을, 아니면 A* 를 쓴다.
+        """
+        alt = self.nearest_layer(altitude if altitude is not None else start[1])
+        a, b = self.map.cell_of(start), self.map.cell_of(goal)
+        key = (alt, a, b)
+
+        for p, (ix, iz) in ((start, a), (goal, b)):
+            if not (0 <= ix < self.map.occ.shape[0] and 0 <= iz < self.map.occ.shape[2]):
+                raise ValueError(f"{p} is outside the airspace map")
+            if not self.map.column_clear(ix, iz, p[1], alt):
+                raise ValueError(f"vertical path at {p} is blocked")
+
+        if key not in self._routes:
+            if (alt, b) in self._flows:
+                cells = self._descend(alt, a, b)
+            else:
+                cells = self.astar(alt, a, b)
+            if cells is None:
+                raise ValueError(f"no route from {start} to {goal} at altitude {alt}")
+            self._routes[key] = np.array(cells, dtype=float) + 0.5
+
+        # 양 끝은 칸 중심 대신 실제 버티포트 위치로
+        pts = self._routes[key].copy()
+        pts[0] = self.map.to_grid(start)
+        pts[-1] = self.map.to_grid(goal)
+        mid = [self.map.world_of(pts[i, 0] - 0.5, pts[i, 1] - 0.5, alt)
+               for i in self.simplify(alt, pts)[1:-1]]
+
+        return ([tuple(start), (start[0], alt, start[2])] + mid +
+                [(goal[0], alt, goal[2]), tuple(goal)])
+
+
+#  FI.py 키 형식으로 변환
+def path_to_keys(waypoints, start=1, speed=0.1):
+    """웨이포인트 → [(attr, frame, value)], speed: 프레임당 이동 거리"""
+    keys = []
+    frame = float(start)
+    prev = None
+    for p in waypoints:
+        if prev is not None:
+            frame += math.dist(prev, p) / speed
+        for attr, v in zip(("translateX", "translateY", "translateZ"), p):
+            keys.append((attr, round(frame, 2), v))
+        prev = p
+    return keys
+
+
+def animate_route(obj, waypoints, start=1, speed=0.1):
+    """obj 에 경로 키를 채널별로 한 번에 기록"""
+    from anim_batch import write_keys
+
+    keys = path_to_keys(waypoints, start, speed)
+    for attr in ("translateX", "translateY", "translateZ"):
+        times = [f for a, f, _ in keys if a == attr]
+        values = [v for a, _, v in keys if a == attr]
+        write_keys(obj, attr, times, values, tangent="auto")
+    return keys
+
+
+if __name__ == "__main__":
+    import time
+
+    amap = AirspaceMap.from_scene()
+    planner = RoutePlanner(amap)
+    ports = [(-24, 0, 0), (24, 0, 0), (0, 0, -24), (0, 0, 24)]
+    planner.precompute(ports)
+
+    t0 = time.perf_counter()
+    n = 0
+    for alt in planner.layers:
+        for a in ports:
+            for b in ports:
+                if a != b:
+                    planner.route(a, b, alt)
+                    n += 1
+    print(f"{n} routes in {time.perf_counter() - t0:.4f}s")
@@ -0,0 +1,233 @@
+import maya.cmds as cmds
+import maya.api.OpenMaya as om
+import maya.api.OpenMayaAnim as oma
+import numpy as np
+
+#  애니메이션 후처리 일괄 편집
+#  - exaggerate_hover / clean_hover_spike / smooth_motion_curve / slow_down_motion 을
+#    오브젝트·속성마다 cmds 호출하는 대신,
+#    관련 커브를 한 번에 배열로 읽어서 → numpy로 연산 체인 적용 → 한 번에 다시 씀
+#  - 쓰기는 undo chunk 하나로 묶여서 Ctrl+Z 한 번에 되돌아감
+
+
+def _anim_curves(obj, attrs=None):
+    """obj에 연결된 animCurve → [(curve, attr)]"""
+    plugs = [f"{obj}.{a}" for a in attrs] if attrs else [obj]
+    found = []
+    for plug in plugs:
+        conns = cmds.listConnections(plug, type="animCurve", source=True,
+                                     destination=False, plugs=False,
+                                     connections=True) or []
+        # connections=True → [dstPlug, curve, dstPlug, curve, ...]
+        for dst, curve in zip(conns[::2], conns[1::2]):
+            found.append((curve, dst.split(".", 1)[1]))
+    return found
+
+
+class AnimBatch(object):
+    """여러 animCurve의 키를 평평한 배열 하나로 들고 있는 편집 버퍼
+
+    times/values/itt/ott 는 키 단위 배열, curve 는 각 키가 속한 커브 번호.
+    편집 메서드는 self를 돌려주므로 체인으로 이어 쓸 수 있다.
+    """
+
+    def __init__(self, curves, owners, times, values, curve, itt, ott):
+        self.curves = curves      # animCurve 노드 이름
+        self.owners = owners      # (obj, attr)
+        self.times = times
+        self.values = values
+        self.curve = curve
+        self.itt = itt
+        self.ott = ott
+        self.dirty = np.zeros(len(curves), dtype=bool)
+
+    # ---------- 읽기 ----------
+    @classmethod
+    def read(cls, objs, attrs=None):
+        curves, owners = [], []
+        for obj in objs:
+            for c, attr in _anim_curves(obj, attrs):
+                curves.append(c)
+                owners.append((obj, attr))
+
+        if not curves:
+            empty = np.zeros(0)
+            return cls([], [], empty, empty, np.zeros(0, dtype=int),
+                       np.zeros(0, dtype=object), np.zeros(0, dtype=object))
+
+        # 커브 전체를 한 번의 쿼리로
+        times = np.array(cmds.keyframe(curves, q=True, timeChange=True), dtype=float)
+        values = np.array(cmds.keyframe(curves, q=True, valueChange=True), dtype=float)
+        itt = np.array(cmds.keyTangent(curves, q=True, inTangentType=True), dtype=object)
+        ott = np.array(cmds.keyTangent(curves, q=True, outTangentType=True), dtype=object)
+        counts = [cmds.keyframe(c, q=True, keyframeCount=True) for c in curves]
+        curve = np.repeat(np.arange(len(curves)), counts)
+
+        return cls(curves, owners, times, values, curve, itt, ott)
+
+    # ---------- 선택 마스크 ----------
+    def _mask(self, time_range=None, objs=None, attrs=None):
+        mask = np.ones(len(self.times), dtype=bool)
+        if time_range is not None:
+            mask &= (self.times >= time_range[0]) & (self.times <= time_range[1])
+        if objs is not None or attrs is not None:
+            ids = [i for i, (o, a) in enumerate(self.owners)
+                   if (objs is None or o in objs) and (attrs is None or a in attrs)]
+            mask &= np.isin(self.curve, ids)
+        return mask
+
+    def _touch(self, mask):
+        self.dirty[np.unique(self.curve[mask])] = True
+
+    # ---------- 편집 연산 ----------
+    def offset(self, amount, time_range=None, objs=None, attrs=None):
+        """값 더하기 (exaggerate_hover)"""
+        m = self._mask(time_range, objs, attrs)
+        self.values[m] += amount
+        self._touch(m)
+        return self
+
+    def cut(self, time_range, objs=None, attrs=None):
+        """구간 안의 키 삭제 (clean_hover_spike)"""
+        m = self._mask(time_range, objs, attrs)
+        self._touch(m)
+        keep = ~m
+        self.times, self.values = self.times[keep], self.values[keep]
+        self.curve, self.itt, self.ott = self.curve[keep], self.itt[keep], self.ott[keep]
+        return self
+
+    def tangents(self, itt="spline", ott="spline", time_range=None, objs=None, attrs=None):
+        """탄젠트 타입 변경 (smooth_motion_curve)"""
+        m = self._mask(time_range, objs, attrs)
+        self.itt[m] = itt
+        self.ott[m] = ott
+        self._touch(m)
+        return self
+
+    def scale_time(self, scale, pivot, time_range=None, objs=None, attrs=None):
+        """pivot 기준 시간 스케일 (slow_down_motion)"""
+        m = self._mask(time_range, objs, attrs)
+        self.times[m] = pivot + (self.times[m] - pivot) * scale
+        self._touch(m)
+        return self
+
+    def apply(self, ops):
+        """[("offset", {...}), ("cut", {...}), ...] 순서대로 적용"""
+        for name, kwargs in ops:
+            getattr(self, name)(**kwargs)
+        return self
+
+    # ---------- 쓰기 ----------
+    def _curve_keys(self, i):
+        sel = self.curve == i
+        t, v = self.times[sel], self.values[sel]
+        itt, ott = self.itt[sel], self.ott[sel]
+
+        # 시간순 정렬, 같은 시간 키는 마지막 것만 유지
+        order = np.argsort(t, kind="stable")
+        t, v, itt, ott = t[order], v[order], itt[order], ott[order]
+        last = np.r_[t[1:] != t[:-1], True] if len(t) else np.zeros(0, dtype=bool)
+        return t[last], v[last], itt[last], ott[last]
+
+    def write(self, chunk_name="animBatch"):
+        """변경된 커브만 한 번에 기록 (undo 한 번)"""
+        cmds.undoInfo(openChunk=True, chunkName=chunk_name)
+        try:
+            for i in np.flatnonzero(self.dirty):
+                curve = self.curves[i]
+                t, v, itt, ott = self._curve_keys(i)
+                old = cmds.keyframe(curve, q=True, keyframeCount=True)
+                n = len(t)
+
+                if n == 0:
+                    cmds.cutKey(curve, clear=True)
+                    continue
+                if old > n:
+                    cmds.cutKey(curve, index=(n, old - 1), clear=True)
+
+                flat = np.column_stack([t, v]).ravel().tolist()
+                cmds.setAttr(f"{curve}.ktv[0:{n - 1}]", *flat, size=n)
+
+                # 같은 탄젠트 조합끼리 묶어서 호출
+                pairs = np.array([f"{a}|{b}" for a, b in zip(itt, ott)])
+                for pair in np.unique(pairs):
+                    a, b = pair.split("|")
+                    idx = np.flatnonzero(pairs == pair)
+                    runs = np.split(idx, np.flatnonzero(np.diff(idx) != 1) + 1)
+                    for run in runs:
+                        cmds.keyTangent(curve, e=True, index=(int(run[0]), int(run[-1])),
+                                        inTangentType=a, outTangentType=b)
+            self.dirty[:] = False
+        finally:
+            cmds.undoInfo(closeChunk=True)
+
+
+#  커브 단위 일괄 읽기/쓰기
+def sample_channels(obj, attrs, frames):
+    """obj 의 attrs 를 frames 마다 평가 → (len(frames), len(attrs)) 배열
+
+    animCurve 가 바로 붙어 있으면 API 로 커브만 평가하고,
+    그 외(클립, 연결 등)는 getAttr(time=) 으로 평가한다.
+    """
+    out = np.zeros((len(frames), len(attrs)))
+    unit = om.MTime.uiUnit()
+    for j, attr in enumerate(attrs):
+        plug = f"{obj}.{attr}"
+        curves = cmds.listConnections(plug, type="animCurve", source=True,
+                                      destination=False) or []
+        if curves:
+            sel = om.MSelectionList()
+            sel.add(curves[0])
+            fn = oma.MFnAnimCurve(sel.getDependNode(0))
+            out[:, j] = [fn.evaluate(om.MTime(float(f), unit)) for f in frames]
+            # 회전 커브는 내부 단위(radian)로 나옴
+            if cmds.nodeType(curves[0]) == "animCurveTA":
+                out[:, j] = np.degrees(out[:, j])
+        elif cmds.listConnections(plug, source=True, destination=False):
+            out[:, j] = [cmds.getAttr(plug, time=float(f)) for f in frames]
+        else:
+            out[:, j] = cmds.getAttr(plug)
+    return out
+
+
+def write_keys(obj, attr, times, values, tangent="spline"):
+    """obj.attr 의 키를 times/values 로 통째로 교체 (커브당 cmds 몇 번)
+
+    tangent=None 이면 Maya 기본 탄젠트(환경설정) 사용
+    """
+    n = len(times)
+    cmds.cutKey(obj, at=attr, clear=True)
+    if n == 0:
+        return None
+
+    cmds.setKeyframe(obj, at=attr, t=float(times[0]), v=float(values[0]))
+    curve = cmds.listConnections(f"{obj}.{attr}", type="animCurve",
+                                 source=True, destination=False)[0]
+
+    flat = np.column_stack([times, values]).ravel().tolist()
+    cmds.setAttr(f"{curve}.ktv[0:{n - 1}]", *flat, size=n)
+    itt = tangent or cmds.keyTangent(q=True, g=True, inTangentType=True)[0]
+    ott = tangent or cmds.keyTangent(q=True, g=True, outTangentType=True)[0]
+    cmds.keyTangent(curve, e=True, index=(0, n - 1),
+                    inTangentType=itt, outTangentType=ott)
+    return curve
+
+
+#  FI.py 후처리 구간을 한 번에
+def postprocess_fleet(v1, v2, v3):
+    """FI.py 의 exaggerate/clean/smooth/slow_down 호출과 같은 결과를 일괄로"""
+    batch = AnimBatch.read([v1, v2, v3])
+    batch.apply([
+        ("offset", dict(amount=0.25, time_range=(1, 60), objs=[v1], attrs=["translateY"])),
+        ("cut", dict(time_range=(50, 50), objs=[v1], attrs=["translateY"])),
+        ("tangents", dict(time_range=(100, 600), objs=[v1], attrs=["translateX"])),
+        ("tangents", dict(time_range=(1, 600), objs=[v2], attrs=["translateX"])),
+        ("tangents", dict(time_range=(1, 600), objs=[v3], attrs=["translateZ"])),
+        ("scale_time", dict(scale=1.3, pivot=1, time_range=(1, 600), objs=[v3])),
+    ])
+    batch.write("postprocess_fleet")
+    return batch
+
+
+if __name__ == "__main__":
+    postprocess_fleet("HoverCar_1", "HoverCar_2", "HoverCar_3")
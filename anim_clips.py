@@ -0,0 +1,162 @@
+import maya.cmds as cmds
+
+import FI
+from anim_batch import sample_channels
+
+#  공유 애니메이션 클립 라이브러리
+#  - 경로/호버 모션을 클립으로 "한 번만" 저장 (차량마다 키를 복제하지 않음)
+#  - 클립 = degree-1 nurbsCurve, 파라미터(u) == 클립 프레임, CV 좌표 == 채널 값 (커브당 3채널)
+#  - 차량은 pointOnCurveInfo 로 클립을 참조하고,
+#    2키짜리 타임워프 커브(parameter 키)로 offset / scale / loop 를 표현
+#  → 키 메모리는 경로 수에 비례, 차량당 비용은 노드 몇 개로 고정
+
+LIBRARY_GRP = "ClipLibrary_grp"
+TRANSLATE = ["translateX", "translateY", "translateZ"]
+
+
+def _library():
+    if not cmds.objExists(LIBRARY_GRP):
+        cmds.group(em=True, name=LIBRARY_GRP)
+        cmds.setAttr(LIBRARY_GRP + ".visibility", 0)
+    return LIBRARY_GRP
+
+
+def _clip_node(name):
+    return f"Clip_{name}"
+
+
+def create_clip(name, samples, channels, start, step=1):
+    """samples[channel] = 프레임별 값 리스트 → 클립 노드
+
+    start 프레임부터 step 간격으로 찍힌 값이어야 한다.
+    """
+    clip = _clip_node(name)
+    if cmds.objExists(clip):
+        cmds.delete(clip)
+
+    clip = cmds.group(em=True, name=clip, parent=_library())
+    n = len(samples[channels[0]])
+    knots = [start + i * step for i in range(n)]
+
+    for k in range(0, len(channels), 3):
+        chans = channels[k:k + 3]
+        cols = [samples[c] for c in chans] + [[0.0] * n] * (3 - len(chans))
+        pts = list(zip(*cols))
+        crv = cmds.curve(d=1, p=pts, k=knots, name=f"{name}_clip{k // 3}_crv")
+        cmds.parent(crv, clip)
+
+    cmds.addAttr(clip, ln="clipStart", at="double", dv=start)
+    cmds.addAttr(clip, ln="clipEnd", at="double", dv=knots[-1])
+    cmds.addAttr(clip, ln="channels", dt="string")
+    cmds.setAttr(clip + ".channels", " ".join(channels), type="string")
+    return clip
+
+
+def clip_from_keys(name, animate_fns, start=1, end=600, step=1,
+                   channels=TRANSLATE, base=(0, 0, 0)):
+    """FI.py 애니메이션 함수들을 임시 로케이터에 적용해서 클립으로 굽기
+
+    예) clip_from_keys("B", [FI.animate_uam_path_B])
+    """
+    tmp = cmds.spaceLocator(name=f"{name}_clipSrc_tmp")[0]
+    cmds.xform(tmp, ws=True, t=base)
+    for fn in animate_fns:
+        fn(tmp)
+
+    # anim_batch 와 같은 평가 (회전 커브는 radian → degree)
+    frames = list(range(start, end + 1, step))
+    values = sample_channels(tmp, channels, frames)
+    samples = {c: values[:, j].tolist() for j, c in enumerate(channels)}
+    cmds.delete(tmp)
+
+    return create_clip(name, samples, channels, start, step)
+
+
+def clip_from_function(name, fn, channels, start=1, end=600, step=1):
+    """fn(frame) → 채널 값 튜플 로 클립 생성 (호버 사인파 등)"""
+    frames = list(range(start, end + 1, step))
+    values = [fn(f) for f in frames]
+    samples = {c: [v[i] for v in values] for i, c in enumerate(channels)}
+    return create_clip(name, samples, channels, start, step)
+
+
+def attach_clip(obj, name, offset=0, scale=1.0, loop=False, channels=None, additive=False,
+                pivot=None):
+    """obj 를 클립에 연결
+
+    offset: 시작 프레임 이동, scale: 시간 배율(>1 이면 느려짐),
+    pivot: scale 기준 프레임 (기본은 이동한 시작 프레임, scaleKey 의 timePivot 과 같음),
+    loop: 클립 구간 반복, additive: 현재 값 + 클립 값 (호버처럼 상대 모션)
+    """
+    clip = _clip_node(name)
+    start = cmds.getAttr(clip + ".clipStart")
+    end = cmds.getAttr(clip + ".clipEnd")
+    clip_channels = cmds.getAttr(clip + ".channels").split()
+    crvs = cmds.listRelatives(clip, children=True, type="transform")
+
+    # 키 복제 대신 u 파라미터용 2키 타임워프
+    pivot = start + offset if pivot is None else pivot
+    t0 = pivot + (start + offset - pivot) * scale
+    t1 = t0 + (end - start) * scale
+    prefix = f"{obj}_{name}"
+
+    pcis = []
+    for k, crv in enumerate(crvs):
+        shape = cmds.listRelatives(crv, shapes=True)[0]
+        pci = cmds.createNode("pointOnCurveInfo", name=f"{prefix}_clip{k}_pci")
+        cmds.connectAttr(shape + ".local", pci + ".inputCurve")
+        pcis.append(pci)
+
+    cmds.setKeyframe(pcis[0], at="parameter", t=t0, v=start)
+    cmds.setKeyframe(pcis[0], at="parameter", t=t1, v=end)
+    cmds.keyTangent(pcis[0], at="parameter", itt="linear", ott="linear")
+    inf = "cycle" if loop else "constant"
+    cmds.setInfinity(pcis[0], at="parameter", pri=inf, poi=inf)
+
+    warp = cmds.listConnections(pcis[0] + ".parameter", type="animCurve")[0]
+    warp = cmds.rename(warp, prefix + "_timeWarp")
+    for pci in pcis[1:]:
+        cmds.connectAttr(warp + ".output", pci + ".parameter")
+
+    for i, chan in enumerate(clip_channels):
+        if channels and chan not in channels:
+            continue
+        src = f"{pcis[i // 3]}.position{'XYZ'[i % 3]}"
+        dst = f"{obj}.{chan}"
+
+        # 기존 키가 있으면 클립으로 대체
+        cmds.cutKey(obj, at=chan, clear=True)
+
+        if additive:
+            add = cmds.createNode("addDoubleLinear", name=f"{prefix}_{chan}_add")
+            cmds.setAttr(add + ".input1", cmds.getAttr(dst))
+            cmds.connectAttr(src, add + ".input2")
+            src = add + ".output"
+        cmds.connectAttr(src, dst, force=True)
+
+    return warp
+
+
+def build_uam_library():
+    """FI.py 의 경로/호버를 클립으로 등록"""
+    import math
+
+    clip_from_keys("A", [FI.animate_hover_and_liftoff, FI.animate_uam_path_A],
+                   base=(0, 2, 0))
+    clip_from_keys("B", [FI.animate_uam_path_B])
+    clip_from_keys("C", [FI.animate_uam_path_C])
+    # 32프레임 한 주기 → loop=True 로 붙이면 끊김 없이 반복
+    clip_from_function("Hover", lambda f: (0.2 * math.sin((f - 1) * math.pi / 16),),
+                       ["translateY"], start=1, end=33)
+    return ["A", "B", "C", "Hover"]
+
+
+if __name__ == "__main__":
+    build_uam_library()
+
+    # FI.py 의 v2(offset=20), v3(offset=40, slow_down 1.3) 와 같은 배치
+    # slow_down_motion 처럼 프레임 1 기준으로 늘림 (시작 41 → 53). 단 FI 는 1~600 안의 키만
+    # 늘려서 600 뒤의 마지막 키(640)는 그대로 → v3 의 끝부분은 FI 와 다름
+    attach_clip("HoverCar_1", "A")
+    attach_clip("HoverCar_2", "B", offset=20)
+    attach_clip("HoverCar_3", "C", offset=40, scale=1.3, pivot=1)
@@ -0,0 +1,381 @@
+import os
+import sys
+import json
+import time
+import queue
+import random
+import types
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+
+import maya.cmds as cmds
+
+import FI
+from anim_batch import write_keys, postprocess_fleet
+from scene_optimizer import shading_engines, remove_unused_shading
+from node_registry import REGISTRY
+
+#  단계별(파이프라인) 씬 빌드
+#  - 각 단계 = compute(순수 파이썬 → plan) + apply(cmds, 메인 스레드)
+#  - compute 결과(plan)는 큐로 들어오고, 메인 스레드는 큐를 비우면서 노드만 생성
+#  - 의존성 있는 단계끼리는 순서 유지
+#  - compute 는 가볍다 (FI 씬 실측: layout ~25us, vehicle_keys ~0.4ms, 나머지 apply 가
+#    전체 시간 거의 전부) + GIL 때문에 스레드를 늘려도 빨라지지 않음 → 기본은 워커 1개.
+#    가속이 목적이 아니라 plan 을 캐시/해시 단위로 나누기 위한 구조
+#  - 단계 입력(파라미터 + 함수 코드(부르는 FI 빌더 포함) + 의존 단계 해시)이 그대로면
+#    다시 빌드하지 않음 (해시는 씬의 network 노드에 기록)
+
+STATE_NODE = "BuildPipeline_state"
+
+# 같은 세션에서 다시 빌드할 때 재사용할 plan {stage: (hash, plan)}
+_PLAN_CACHE = {}
+
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def _local_module(obj):
+    """이 저장소의 모듈인지 (FI, anim_batch ... / cmds, 표준 라이브러리는 제외)"""
+    path = getattr(obj, "__file__", None)
+    return (isinstance(obj, types.ModuleType) and path is not None
+            and os.path.dirname(os.path.abspath(path)) == _HERE)
+
+
+def _local_function(obj):
+    return (isinstance(obj, types.FunctionType)
+            and _local_module(sys.modules.get(obj.__module__)))
+
+
+_PLAIN = (type(None), bool, int, float, complex, str, bytes)
+
+
+def _data_repr(obj):
+    """기본형 / 리스트·튜플·딕셔너리로만 된 데이터면 repr, 아니면 None (주소가 들어가는 객체 제외)"""
+    def plain(o):
+        if isinstance(o, _PLAIN):
+            return True
+        if isinstance(o, (list, tuple)):
+            return all(plain(v) for v in o)
+        if isinstance(o, dict):
+            return all(plain(k) and plain(v) for k, v in o.items())
+        return False
+    return repr(obj) if plain(obj) else None
+
+
+def _code_digest(fn):
+    """함수 코드 해시 — 그 함수가 부르는 저장소 함수(FI 빌더 등)까지 재귀로 포함
+
+    _apply_* 는 FI.create_* 를 부르는 얇은 래퍼라서 래퍼만 해시하면 빌더를 고쳐도
+    단계가 그대로 남는다. 전역 이름 / 모듈.속성 으로 참조하는 함수를 따라가고,
+    참조하는 모듈 전역 데이터(FI.UAM_PATHS, TAXI_PATH ...)와 기본 인자 값도 넣는다.
+    """
+    if fn is None:
+        return ""
+    h = hashlib.sha1()
+    seen = set()
+    stack = [fn]
+
+    def data(name, obj):
+        r = _data_repr(obj)
+        if r is not None:
+            h.update(f"{name}={r}".encode())
+
+    while stack:
+        f = stack.pop()
+        if f in seen:
+            continue
+        seen.add(f)
+        for i, v in enumerate(f.__defaults__ or ()):
+            data(f"default{i}", v)
+        for k, v in (f.__kwdefaults__ or {}).items():
+            data(k, v)
+        codes = [f.__code__]
+        while codes:
+            code = codes.pop()
+            # 중첩 코드 객체는 repr 에 주소가 들어가서 따로 해시
+            nested = [c for c in code.co_consts if isinstance(c, types.CodeType)]
+            consts = [c for c in code.co_consts if not isinstance(c, types.CodeType)]
+            h.update(code.co_code + repr(consts).encode())
+            codes += nested
+            for name in code.co_names:
+                obj = f.__globals__.get(name)
+                if _local_function(obj):
+                    stack.append(obj)
+                elif _local_module(obj):
+                    for a in code.co_names:
+                        attr = getattr(obj, a, None)
+                        if _local_function(attr):
+                            stack.append(attr)
+                        elif a in vars(obj):
+                            data(f"{obj.__name__}.{a}", attr)
+                elif name in f.__globals__:
+                    data(name, obj)
+    return h.hexdigest()
+
+
+class Stage(object):
+    def __init__(self, name, deps=(), compute=None, apply=None, params=None):
+        self.name = name
+        self.deps = list(deps)
+        self.compute = compute    # compute(params, dep_plans) -> plan
+        self.apply = apply        # apply(plan, params) -> [생성된 노드]
+        self.params = params or {}
+
+
+class BuildPipeline(object):
+    def __init__(self, state_node=STATE_NODE):
+        self.stages = {}
+        self.state_node = state_node
+
+    def stage(self, name, deps=(), compute=None, apply=None, params=None):
+        for d in deps:
+            if d not in self.stages:
+                raise ValueError(f"stage '{name}': unknown dependency '{d}'")
+        self.stages[name] = Stage(name, deps, compute, apply, params)
+        return self.stages[name]
+
+    # ---------- 상태 (씬에 저장) ----------
+    def _load_state(self):
+        if not cmds.objExists(self.state_node):
+            return {}
+        return json.loads(cmds.getAttr(self.state_node + ".stages") or "{}")
+
+    def _save_state(self, state):
+        if not cmds.objExists(self.state_node):
+            cmds.createNode("network", name=self.state_node)
+            cmds.addAttr(self.state_node, ln="stages", dt="string")
+        cmds.setAttr(self.state_node + ".stages", json.dumps(state), type="string")
+
+    def _hashes(self):
+        """등록 순서(= 위상 순서)대로 단계 해시 계산"""
+        hashes = {}
+        for name, st in self.stages.items():
+            h = hashlib.sha1()
+            h.update(json.dumps(st.params, sort_keys=True, default=repr).encode())
+            h.update(_code_digest(st.compute).encode())
+            h.update(_code_digest(st.apply).encode())
+            for d in st.deps:
+                h.update(hashes[d].encode())
+            hashes[name] = h.hexdigest()
+        return hashes
+
+    # ---------- 실행 ----------
+    def run(self, force=False, executor=None, workers=None):
+        hashes = self._hashes()
+        state = self._load_state()
+
+        def up_to_date(name):
+            rec = state.get(name)
+            return (not force and rec and rec["hash"] == hashes[name]
+                    and all(REGISTRY.exists(n) for n in rec["nodes"]))
+
+        # 의존 단계를 다시 빌드하면 같이 다시 빌드 (노드가 없어서 다시 만드는 경우는
+        # 해시가 그대로라서 전파가 안 됨 → 등록 순서 = 위상 순서로 직접 전파)
+        todo = []
+        for n, st in self.stages.items():
+            if not up_to_date(n) or any(d in todo for d in st.deps):
+                todo.append(n)
+        report = {n: {"compute": 0.0, "apply": 0.0, "skipped": n not in todo}
+                  for n in self.stages}
+
+        # plan 이 필요한 단계: 다시 빌드할 단계 + 그 의존 단계 (캐시에 없을 때만)
+        plans = {}
+        need = set()
+        stack = list(todo)
+        while stack:
+            n = stack.pop()
+            if n in need:
+                continue
+            cached = _PLAN_CACHE.get(n)
+            if cached and cached[0] == hashes[n]:
+                plans[n] = cached[1]
+            elif self.stages[n].compute is None:
+                plans[n] = None
+            else:
+                need.add(n)
+            stack.extend(self.stages[n].deps)
+
+        results = queue.Queue()
+        own_pool = executor is None
+        pool = executor or ThreadPoolExecutor(max_workers=workers or 1)
+        submitted = set()
+
+        def submit_ready():
+            for n in need - submitted:
+                st = self.stages[n]
+                if all(d in plans for d in st.deps):
+                    submitted.add(n)
+                    dep_plans = {d: plans[d] for d in st.deps}
+                    fut = pool.submit(_timed, st.compute, st.params, dep_plans)
+                    fut.add_done_callback(lambda f, n=n: results.put((n, f)))
+
+        applied = set(n for n in self.stages if n not in todo)
+        t0 = time.perf_counter()
+        try:
+            submit_ready()
+            while len(applied) < len(self.stages):
+                # 메인 스레드: plan 이 준비되고 의존 단계가 끝난 단계부터 노드 생성
+                ready = [n for n in todo if n not in applied and n in plans
+                         and all(d in applied for d in self.stages[n].deps)]
+                if ready:
+                    n = ready[0]
+                    report[n]["apply"] = self._apply(n, plans[n], hashes[n], state)
+                    applied.add(n)
+                    continue
+
+                n, fut = results.get()
+                plan, seconds = fut.result()      # 워커 예외는 여기서 다시 발생
+                plans[n] = plan
+                _PLAN_CACHE[n] = (hashes[n], plan)
+                report[n]["compute"] = seconds
+                submit_ready()
+        finally:
+            if own_pool:
+                pool.shutdown(wait=False)
+            self._save_state(state)
+
+        print_report(report, time.perf_counter() - t0)
+        return report
+
+    def _apply(self, name, plan, digest, state):
+        st = self.stages[name]
+        old = [REGISTRY.path(n) for n in state.get(name, {}).get("nodes", [])
+               if REGISTRY.exists(n)]
+        if old:
+            # 이 단계 노드가 쓰던 SG 만 정리 (다른 단계/사용자 셰이더는 건드리지 않음)
+            sgs = shading_engines(old)
+            cmds.delete(old)
+            remove_unused_shading(sgs)
+
+        t0 = time.perf_counter()
+        # 단계가 만든 노드는 생성 시점 핸들로 등록 → 이후 확인/편집에 이름 검색 없음
+        with REGISTRY.recording():
+            nodes = (st.apply(plan, st.params) or []) if st.apply else []
+        state[name] = {"hash": digest, "nodes": list(nodes)}
+        return time.perf_counter() - t0
+
+
+def _timed(fn, params, dep_plans):
+    t0 = time.perf_counter()
+    plan = fn(params, dep_plans)
+    return plan, time.perf_counter() - t0
+
+
+def print_report(report, wall):
+    print("%-16s %9s %9s" % ("stage", "compute", "apply"))
+    for n, r in report.items():
+        if r["skipped"]:
+            print("%-16s %19s" % (n, "(unchanged)"))
+        else:
+            print("%-16s %9.3f %9.3f" % (n, r["compute"], r["apply"]))
+    print(f"wall {wall:.3f}s")
+
+
+#  FI.py 씬을 단계로 나눈 정의
+HOVERCARS = [("HoverCar_1", (0, 2, 0)), ("HoverCar_2", (-6, 2, -4)), ("HoverCar_3", (6, 2, 4))]
+
+
+def _plan_layout(params, deps):
+    return {"buildings": FI.plan_extra_buildings(random.Random(params["seed"]))}
+
+
+def _apply_environment(plan, params):
+    FI.create_city_environment()
+    trees = [f"Tree_{i + 1}" for i in range(6)]
+    return ["Ground", "Building_1", "Building_2"] + trees
+
+
+def _apply_road(plan, params):
+    return [FI.add_road_and_sidewalk()]
+
+
+def _apply_streetlights(plan, params):
+    lights = FI.add_streetlights_row(step=params["step"])
+    cmds.parent(lights, "CityExtra_grp")
+    return ["CityExtra_grp|" + lights]
+
+
+def _apply_buildings(plan, params):
+    bld = FI.add_extra_buildings(plan)
+    cmds.parent(bld, "CityExtra_grp")
+    return ["CityExtra_grp|" + bld]
+
+
+def _plan_buildings(params, deps):
+    return deps["layout"]["buildings"]
+
+
+def _apply_vehicles(plan, params):
+    roots = []
+    for i, (name, pos) in enumerate(params["cars"]):
+        root, _ = FI.create_hovercar_v9_1(name)
+        cmds.xform(root, ws=True, t=pos)
+        cmds.rotate(0, (i * 15) - 10, 0, root)
+        roots.append(root)
+    return roots
+
+
+def _plan_vehicle_keys(params, deps):
+    """차량별 [(obj, attr, frame, value)] — 사인 샘플링, 경로 키 계산"""
+    (v1, p1), (v2, _), (v3, _) = params["cars"]
+    keys = [(v1,) + k for k in FI.hover_and_liftoff_keys(p1[1])]
+    keys += [(v1,) + k for k in FI.uam_path_keys("A", 100, 600)]
+    keys += [(v2,) + k for k in FI.uam_path_keys("B", 1, 600, offset=20)]
+    keys += [(v3,) + k for k in FI.uam_path_keys("C", 1, 600, offset=40)]
+
+    for i, (name, _) in enumerate(params["cars"]):
+        glow = FI.engine_glow_keys(offset=i * 15)
+        for side in "LR":
+            keys += [(f"{name}_EngineGlow_{side}",) + k for k in glow]
+    return _group_keys(keys)
+
+
+def _group_keys(keys):
+    """(obj, attr) 별로 frame 순 정렬 → {(obj, attr): (times, values)}"""
+    curves = {}
+    for obj, attr, f, v in keys:
+        curves.setdefault((obj, attr), {})[f] = v
+    return {k: (sorted(d), [d[f] for f in sorted(d)]) for k, d in curves.items()}
+
+
+def _apply_vehicle_keys(plan, params):
+    for (obj, attr), (times, values) in plan.items():
+        # FI.animate_engine_glow 처럼 없는 속성은 건너뜀
+        if not cmds.attributeQuery(attr, node=obj, exists=True):
+            continue
+        write_keys(obj, attr, times, values, tangent=None)
+    # 후처리(+오프셋, 시간 스케일)는 멱등이 아니라 따로 단계로 두면 후처리만 다시 돌 때
+    # 이미 처리된 키에 한 번 더 적용됨 → 키를 새로 쓴 직후에만 실행
+    postprocess_fleet(*[name for name, _ in params["cars"]])
+    return []
+
+
+def _apply_taxi(plan, params):
+    taxi = FI.create_flying_taxi()
+    cmds.xform(taxi, ws=True, t=(0, 10, 0))
+    FI.animate_taxi(taxi)
+    return [taxi, "rotorSpin_expr"]
+
+
+def _apply_skydome(plan, params):
+    return [FI.add_skydome_night()]
+
+
+def fi_pipeline():
+    p = BuildPipeline()
+    p.stage("layout", compute=_plan_layout, params={"seed": 7})
+    p.stage("environment", apply=_apply_environment)
+    p.stage("road", apply=_apply_road)
+    p.stage("streetlights", deps=["road"], apply=_apply_streetlights, params={"step": 8})
+    p.stage("buildings", deps=["road", "layout"], compute=_plan_buildings,
+            apply=_apply_buildings)
+    p.stage("vehicles", apply=_apply_vehicles, params={"cars": HOVERCARS})
+    p.stage("vehicle_keys", deps=["vehicles"], compute=_plan_vehicle_keys,
+            apply=_apply_vehicle_keys, params={"cars": HOVERCARS})
+    p.stage("taxi", apply=_apply_taxi)
+    p.stage("skydome", apply=_apply_skydome)
+    return p
+
+
+if __name__ == "__main__":
+    fi_pipeline().run()
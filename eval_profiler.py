@@ -0,0 +1,168 @@
+import re
+import maya.cmds as cmds
+
+#  평가 그래프 점검 + 노드별 프레임 시간 프로파일
+#  - DG/직렬 평가를 강제하는 노드 찾기: expression, 사이클, 스크립트(플러그인) 노드,
+#    아무것도 안 움직이는 키(정적 커브/연결 안 된 커브), 반투명 재질
+#  - Maya profiler 로 프레임 구간 재생하면서 노드별 평가 시간 수집
+#  - 노드 이름으로 FI.py 의 어느 빌더가 만든 노드인지 묶어서 비용 순위 출력
+
+# 노드 이름 → FI.py 빌더
+BUILDERS = [
+    (r"^HoverCar_\d+", "create_hovercar_v9_1"),
+    (r"^(flyingTaxi|taxi|rotor_|arm_|headLight_|light_mat|rotorSpin_expr)", "create_flying_taxi"),
+    (r"^(Ground|Building_(\d|Facade)|Tree_)", "create_city_environment"),
+    (r"^(ExtraRoad|ExtraSidewalk|ExtraLine|Extra_(Asphalt|Sidewalk|Line)_mat|CityExtra)",
+     "add_road_and_sidewalk"),
+    (r"^(ExtraStreetLight|StreetLightsExtra|Extra_Light(Metal|Bulb)_mat)", "add_streetlight"),
+    (r"^(ExtraBuilding|BuildingsExtra)", "add_extra_buildings"),
+    (r"^(ExtraSkyDome|Extra_Sky_mat)", "add_skydome_night"),
+]
+
+
+def builder_of(node):
+    """노드 → 빌더 이름 (직접 매칭 안 되면 연결된 노드로 추적)"""
+    short = node.split("|")[-1]
+    for pat, builder in BUILDERS:
+        if re.match(pat, short):
+            return builder
+    if cmds.objExists(node):
+        for other in cmds.listConnections(node, source=True, destination=True) or []:
+            for pat, builder in BUILDERS:
+                if re.match(pat, other.split("|")[-1]):
+                    return builder
+    return "other"
+
+
+#  정적 점검
+def _serial_node_types():
+    """EM 이 직렬/untrusted 로 취급하는 노드 타입"""
+    types = {}
+    for flag, label in (("nodeTypeUntrusted", "untrusted"),
+                        ("nodeTypeGloballySerialize", "globally serial"),
+                        ("nodeTypeSerialize", "serial")):
+        try:
+            for t in cmds.evaluationManager(q=True, **{flag: True}) or []:
+                types.setdefault(t, label)
+        except TypeError:
+            pass
+    return types
+
+
+def _plugin_node_types():
+    types = set()
+    for plugin in cmds.pluginInfo(q=True, listPlugins=True) or []:
+        types.update(cmds.pluginInfo(plugin, q=True, dependNode=True) or [])
+    return types
+
+
+def audit_scene():
+    """문제 노드 목록 [(node, issue)]"""
+    issues = []
+
+    for expr in cmds.ls(type="expression") or []:
+        issues.append((expr, "expression (DG evaluation, blocks parallel)"))
+
+    try:
+        cycle = cmds.cycleCheck(all=True, list=True) or []
+    except RuntimeError:
+        cycle = []
+    for node in cycle:
+        issues.append((node, "in DG cycle"))
+
+    serial = _serial_node_types()
+    plugin = _plugin_node_types()
+    for node in cmds.ls(dependencyNodes=True) or []:
+        t = cmds.nodeType(node)
+        if t in serial:
+            issues.append((node, f"{serial[t]} node type '{t}'"))
+        elif t in plugin:
+            issues.append((node, f"scripted/plugin node type '{t}'"))
+
+    for curve in cmds.ls(type="animCurve") or []:
+        if not cmds.listConnections(curve + ".output", source=False, destination=True):
+            issues.append((curve, "animCurve drives nothing"))
+            continue
+        values = cmds.keyframe(curve, q=True, valueChange=True) or []
+        if len(values) > 1 and max(values) - min(values) < 1e-6:
+            issues.append((curve, "static animCurve (all keys equal)"))
+
+    for mat in cmds.ls(materials=True) or []:
+        if cmds.attributeQuery("transparency", node=mat, exists=True):
+            t = cmds.getAttr(mat + ".transparency")[0]
+            if max(t) > 0.0:
+                members = 0
+                for sg in cmds.listConnections(mat, type="shadingEngine") or []:
+                    members += len(cmds.sets(sg, q=True) or [])
+                if members:
+                    issues.append((mat, f"transparent material on {members} objects "
+                                        "(depth peeling in viewport)"))
+    return issues
+
+
+#  프로파일
+def profile_frames(start=1, end=600, step=1, buffer_mb=200):
+    """profiler 샘플링 중 프레임을 직접 넘기며 평가 → {node: 누적 시간}"""
+    cmds.profiler(bufferSize=buffer_mb)
+    cmds.profiler(reset=True)
+    cmds.profiler(sampling=True)
+    try:
+        for f in range(start, end + 1, step):
+            cmds.currentTime(f, update=True)
+            cmds.refresh(force=True)
+    finally:
+        cmds.profiler(sampling=False)
+
+    # 이벤트 이름/설명에 노드 이름이 들어 있는 것만 노드 비용으로 집계
+    totals = {}
+    for i in range(cmds.profiler(q=True, eventCount=True) or 0):
+        name = cmds.profiler(q=True, eventIndex=i, eventName=True) or ""
+        desc = cmds.profiler(q=True, eventIndex=i, eventDescription=True) or ""
+        node = None
+        for token in (desc, name):
+            token = token.split(".")[0].strip()
+            if token and cmds.objExists(token):
+                node = token
+                break
+        if node is None:
+            continue
+        dur = cmds.profiler(q=True, eventIndex=i, eventDuration=True) or 0
+        totals[node] = totals.get(node, 0) + dur
+    return totals
+
+
+def report(start=1, end=600, step=1, top=20):
+    """점검 결과 + 노드/빌더별 비용 순위 출력"""
+    issues = audit_scene()
+    totals = profile_frames(start, end, step)
+    frames = len(range(start, end + 1, step))
+
+    print("=== audit ===")
+    for node, issue in issues:
+        print(f"  {node:<32} {issue}  [{builder_of(node)}]")
+
+    print(f"=== costliest nodes ({frames} frames, us/frame) ===")
+    ranked = sorted(totals.items(), key=lambda kv: kv[1], reverse=True)
+    for node, t in ranked[:top]:
+        print(f"  {t / frames:>10.1f}  {node:<32} [{builder_of(node)}]")
+
+    by_builder = {}
+    for node, t in totals.items():
+        b = builder_of(node)
+        by_builder[b] = by_builder.get(b, 0) + t
+    for node, _ in issues:
+        by_builder.setdefault(builder_of(node), 0)
+
+    print("=== by builder (us/frame, issues) ===")
+    counts = {}
+    for node, _ in issues:
+        b = builder_of(node)
+        counts[b] = counts.get(b, 0) + 1
+    for b, t in sorted(by_builder.items(), key=lambda kv: kv[1], reverse=True):
+        print(f"  {t / frames:>10.1f}  {b:<28} {counts.get(b, 0)} issues")
+
+    return issues, totals, by_builder
+
+
+if __name__ == "__main__":
+    report()
@@ -0,0 +1,317 @@
+import math
+import numpy as np
+
+import maya.cmds as cmds
+
+import FI
+import anim_clips
+from anim_batch import write_keys
+from mesh_builder import cube, combine, create_mesh
+
+#  도로 위 지상 교통 (IDM 차량 추종 모델)
+#  - add_road_and_sidewalk 가 만든 도로 바운딩 박스에서 차선을 맞춤 (우측 통행, 중앙선 기준 양방향)
+#  - 차선마다 입구로 들어와 출구로 나가는 차량을 numpy 배열 하나로 한 번에 갱신
+#    (앞차는 같은 차선에 바로 전에 들어온 차 — 추월이 없으므로 순서 고정)
+#  - 차선 중간 신호등: 빨간불이면 정지선을 멈춰 있는 가상의 앞차로 취급
+#  - 굽기: 차량마다 키를 찍지 않고, 통과 프로파일(진행률 vs 시간)을 k-means 로 묶어
+#    몇 개의 공유 클립(anim_clips)으로 만들고 차량은 instance + offset/scale 타임워프로 참조
+
+ROAD_PATTERNS = ["ExtraRoad*_geo"]
+TRAFFIC_GRP = "GroundTraffic_grp"
+
+# IDM 파라미터 (m, s)
+IDM = dict(v0=11.0, T=1.2, a=1.5, b=2.0, s0=2.0, delta=4, length=4.5)
+
+
+class Lane(object):
+    def __init__(self, origin, heading, length):
+        self.origin = origin        # 차선 시작점 (x, y, z)
+        self.heading = heading      # rotateY (0 → +X 방향)
+        self.length = length
+
+
+def fit_lanes(road, lane_width=3.0):
+    """도로 메쉬 바운딩 박스 → 양방향 차선 [Lane] (긴 축 방향, 우측 통행)"""
+    x0, y0, z0, x1, y1, z1 = cmds.exactWorldBoundingBox(road)
+    along_x = (x1 - x0) >= (z1 - z0)
+    length, width = (x1 - x0, z1 - z0) if along_x else (z1 - z0, x1 - x0)
+    cx, cz = (x0 + x1) / 2, (z0 + z1) / 2
+    per_side = max(1, int(width / 2 // lane_width))
+
+    lanes = []
+    for k in range(per_side):
+        off = (k + 0.5) * lane_width
+        if along_x:
+            # +X 로 달리면 오른쪽이 +Z
+            lanes.append(Lane((x0, y1, cz + off), 0.0, length))
+            lanes.append(Lane((x1, y1, cz - off), 180.0, length))
+        else:
+            # +Z 로 달리면 오른쪽이 -X
+            lanes.append(Lane((cx - off, y1, z0), -90.0, length))
+            lanes.append(Lane((cx + off, y1, z1), 90.0, length))
+    return lanes
+
+
+def scene_lanes(patterns=ROAD_PATTERNS, lane_width=3.0):
+    lanes = []
+    for pat in patterns:
+        for road in cmds.ls(pat, type="transform") or []:
+            lanes += fit_lanes(road, lane_width)
+    return lanes
+
+
+#  시뮬레이션 (cmds 없음)
+def simulate(lane_lengths, seconds=25.0, fps=24.0, inflow=0.4, warmup=10.0,
+             signal=(0.5, 30.0, 12.0), substeps=2, rng=None, params=IDM):
+    """차선별 IDM 시뮬레이션 → dict
+
+    lane_lengths: 차선 길이 리스트, inflow: 차선당 초당 도착 차량 (포아송)
+    signal: (정지선 위치 비율, 주기 s, 빨간불 s) 또는 None — 차선마다 위상은 무작위
+    반환: lane, t_in, t_out (프레임, 1 = 시작), frames (프레임 배열), s (프레임, 차) 진행 거리
+    워밍업 구간부터 마지막 차가 빠져나갈 때까지 기록 (클립 프로파일용)
+    """
+    rng = rng or np.random.default_rng()
+    p = params
+    lengths = np.asarray(lane_lengths, dtype=float)
+    n_lanes = len(lengths)
+
+    # 도착 시각 미리 뽑기: 차선마다 cap 대, 차 번호 = lane * cap + k (k-1 이 앞차)
+    total = warmup + seconds
+    cap = int(total * inflow * 1.5) + 10
+    arrive = np.cumsum(rng.exponential(1.0 / inflow, (n_lanes, cap)), axis=1) - warmup
+    arrive = arrive.ravel()
+    n = n_lanes * cap
+    lane = np.repeat(np.arange(n_lanes), cap)
+    L = lengths[lane]
+    has_leader = np.arange(n) % cap > 0
+    leader = np.where(has_leader, np.arange(n) - 1, 0)
+    v0 = p["v0"] * rng.uniform(0.85, 1.15, n)
+    sqrt_ab = 2.0 * math.sqrt(p["a"] * p["b"])
+
+    if signal:
+        stop_s = lengths * signal[0]
+        phase = rng.uniform(0, signal[1], n_lanes)
+
+    s = np.zeros(n)
+    v = np.zeros(n)
+    active = np.zeros(n, bool)
+    done = np.zeros(n, bool)
+    t_in = np.full(n, np.nan)
+    t_out = np.full(n, np.nan)
+    next_car = np.arange(n_lanes) * cap          # 차선별 다음 입장 후보
+    lane_end = next_car + cap
+
+    dt = 1.0 / fps / substeps
+    frames, rec = [], []
+    t = -warmup
+    i = 0
+    while True:
+        spawning = t < seconds
+        if not spawning and not active.any():
+            break
+
+        # 입장: 도착 시각이 지났고 입구가 비어 있으면 (차선마다 맨 앞 후보 한 대)
+        if spawning:
+            c = np.minimum(next_car, lane_end - 1)
+            prev = np.maximum(c - 1, 0)
+            lead_on = has_leader[c] & active[prev]
+            ok = ((next_car < lane_end) & (arrive[c] <= t) &
+                  ~(lead_on & (s[prev] < p["length"] + p["s0"])))
+            idx = c[ok]
+            active[idx] = True
+            s[idx] = 0.0
+            v[idx] = np.where(lead_on[ok], np.minimum(v0[idx], v[prev[ok]]), v0[idx] * 0.8)
+            t_in[idx] = t * fps + 1
+            next_car[ok] += 1
+
+        # IDM 가속도 (모든 차 한 번에)
+        lead_on = has_leader & active[leader]
+        gap = np.where(lead_on, s[leader] - s - p["length"], np.inf)
+        dv = np.where(lead_on, v - v[leader], 0.0)
+        if signal:
+            red = ((t + phase) % signal[1]) < signal[2]
+            to_stop = stop_s[lane] - s
+            # 이미 못 서는 거리(딜레마 구간)면 그냥 통과
+            stop = red[lane] & (to_stop > 0) & (to_stop > v * v / (4.0 * p["b"]))
+            gap = np.where(stop & (to_stop < gap), to_stop, gap)
+            dv = np.where(stop & (to_stop <= gap), v, dv)
+        gap = np.maximum(gap, 0.1)
+        s_star = p["s0"] + np.maximum(0.0, v * p["T"] + v * dv / sqrt_ab)
+        acc = p["a"] * (1 - (v / v0) ** p["delta"] - (s_star / gap) ** 2)
+
+        v_new = np.maximum(v + acc * dt, 0.0)
+        s = np.where(active, s + (v + v_new) * 0.5 * dt, s)
+        v = np.where(active, v_new, v)
+
+        # 퇴장
+        leaving = active & (s >= L)
+        active[leaving] = False
+        done[leaving] = True
+        t_out[leaving] = (t + dt) * fps + 1
+
+        t += dt
+        i += 1
+        if i % substeps == 0:
+            frames.append(t * fps + 1)
+            rec.append(np.where(active, s, np.nan).astype(np.float32))
+
+    # 시작 프레임 전에 이미 빠져나간 차(워밍업)는 제외
+    keep = done & (t_out >= 1)
+    return dict(lane=lane[keep], t_in=t_in[keep], t_out=t_out[keep],
+                frames=np.array(frames), s=np.array(rec)[:, keep], v0=v0[keep])
+
+
+#  공유 클립으로 압축
+def profiles(sim, lengths, samples=32):
+    """차마다 통과 프로파일: 정규화 시간(0..1) 에서의 진행률 (n, samples)
+
+    기록 프레임 사이에 있는 진입/퇴장 시점을 (0, 1) 끝점으로 붙여서 보간한다.
+    """
+    tau = np.linspace(0, 1, samples)
+    out = np.zeros((len(sim["t_in"]), samples))
+    for i in range(len(out)):
+        rows = ~np.isnan(sim["s"][:, i])
+        f = np.r_[sim["t_in"][i], sim["frames"][rows], sim["t_out"][i]]
+        u = np.r_[0.0, sim["s"][rows, i] / lengths[sim["lane"][i]], 1.0]
+        out[i] = np.interp(sim["t_in"][i] + tau * (sim["t_out"][i] - sim["t_in"][i]), f, u)
+    return np.maximum.accumulate(out, axis=1)
+
+
+def cluster_profiles(prof, k=24, iters=20, rng=None, centers=None):
+    """k-means → (중심 프로파일 (k, samples), 차별 라벨), centers 를 주면 그걸로 시작"""
+    if centers is None:
+        rng = rng or np.random.default_rng(0)
+        centers = prof[rng.choice(len(prof), min(k, len(prof)), replace=False)]
+    centers = centers.copy()
+    k = len(centers)
+    for _ in range(iters):
+        d = ((prof[:, None, :] - centers[None]) ** 2).sum(-1)
+        label = d.argmin(1)
+        for c in range(k):
+            if (label == c).any():
+                centers[c] = prof[label == c].mean(0)
+    return centers, label
+
+
+def fit_clips(sim, lengths, k=24, tol=IDM["s0"] / 2, iters=20):
+    """차마다 위치 오차가 tol (m) 아래가 될 때까지 클립을 늘려 가며 k-means → (중심, 라벨)
+
+    tol 기본값 s0/2: 앞뒤 차가 반대 방향으로 틀려도 정지 간격 s0 안이라 겹치지 않음.
+    k 만 키우면 무작위 시작점 때문에 튀는 차가 계속 큰 클러스터에 남으므로,
+    넘는 차가 있는 클러스터마다 가장 나쁜 차의 프로파일을 새 중심으로 넣고 다시 묶는다.
+    """
+    prof = profiles(sim, lengths)
+    centers, label = cluster_profiles(prof, k, iters)
+    while len(centers) < len(prof):
+        worst = np.array([np.abs(e).max() for e in _car_errors(sim, lengths, centers, label)])
+        over = np.flatnonzero(worst >= tol)
+        if not len(over):
+            break
+        add = [over[label[over] == c][worst[over[label[over] == c]].argmax()]
+               for c in np.unique(label[over])]
+        centers, label = cluster_profiles(prof, iters=iters,
+                                          centers=np.vstack([centers, prof[add]]))
+    return centers, label
+
+
+def bake(lanes, sim, clips=24, prefix="Traffic"):
+    """시뮬레이션 결과 → 공유 클립 + 차량 instance (차선 그룹 아래, 로컬 +X 로 진행)
+
+    clips 는 시작 클립 수 — 오차가 s0/2 를 넘는 차가 있으면 fit_clips 가 늘린다.
+    반환: (차량 리스트, 클립 수, (rms, max) 오차)
+    """
+    lengths = np.array([ln.length for ln in lanes])
+    centers, label = fit_clips(sim, lengths, clips)
+    dur = sim["t_out"] - sim["t_in"]
+
+    # 클립 = 길이 1 짜리 진행률 × 차선 길이 → 차선 길이가 같으면 모든 차선이 공유
+    root = TRAFFIC_GRP
+    if not cmds.objExists(root):
+        root = cmds.group(em=True, name=root)
+    clip_frames = {}
+    for c in range(len(centers)):
+        members = label == c
+        if not members.any():
+            continue
+        for length in np.unique(lengths[sim["lane"][members]]):
+            name = f"{prefix}_{c}_{int(round(length))}"
+            frames = max(2, int(round(np.median(dur[members]))))
+            u = np.interp(np.linspace(0, 1, frames + 1), np.linspace(0, 1, len(centers[c])),
+                          centers[c])
+            anim_clips.create_clip(name, {"translateX": (u * length).tolist()},
+                                   ["translateX"], start=1)
+            clip_frames[name] = frames
+
+    proto = _car_prototype(root)
+    lane_grps = []
+    for i, ln in enumerate(lanes):
+        g = cmds.group(em=True, name=f"{prefix}Lane_{i}_grp", parent=root)
+        cmds.xform(g, t=ln.origin, ro=(0, ln.heading, 0))
+        lane_grps.append(g)
+
+    cars = []
+    for i in range(len(label)):
+        name = f"{prefix}_{label[i]}_{int(round(lengths[sim['lane'][i]]))}"
+        car = cmds.instance(proto, name=f"{prefix}Car_{i}")[0]
+        car = cmds.parent(car, lane_grps[sim["lane"][i]], relative=True)[0]
+        cmds.setAttr(car + ".visibility", 1)
+        # 진입 프레임에 클립 시작, 통과 시간에 맞춰 시간 배율
+        anim_clips.attach_clip(car, name, offset=sim["t_in"][i] - 1,
+                               scale=dur[i] / clip_frames[name], channels=["translateX"])
+        t0, t1 = math.floor(sim["t_in"][i]), math.ceil(sim["t_out"][i])
+        write_keys(car, "visibility", [t0 - 1, t0, t1, t1 + 1], [0, 1, 1, 0], tangent="step")
+        cars.append(car)
+    return cars, len(clip_frames), clip_error(sim, lengths, centers, label)
+
+
+def _car_errors(sim, lengths, centers, label):
+    """차마다 기록 프레임에서의 (클립 위치 - 시뮬레이션 위치) 배열 리스트"""
+    err = []
+    for i in range(len(label)):
+        rows = ~np.isnan(sim["s"][:, i])
+        f = np.r_[sim["t_in"][i], sim["frames"][rows]]
+        s = np.r_[0.0, sim["s"][rows, i]]
+        tau = (f - sim["t_in"][i]) / (sim["t_out"][i] - sim["t_in"][i])
+        c = centers[label[i]]
+        approx = np.interp(tau, np.linspace(0, 1, len(c)), c) * lengths[sim["lane"][i]]
+        err.append(approx - s)
+    return err
+
+
+def clip_error(sim, lengths, centers, label):
+    """공유 클립으로 바꿨을 때 위치 오차 (m) → (rms, max)"""
+    err = _car_errors(sim, lengths, centers, label)
+    err = np.concatenate(err) if err else np.zeros(1)
+    return float(np.sqrt((err ** 2).mean())), float(np.abs(err).max())
+
+
+def _car_prototype(root):
+    """차체 + 캐빈 박스 한 메쉬 (모든 차량이 instance 로 공유)"""
+    proto = "TrafficCar_proto"
+    if cmds.objExists(proto):
+        return proto
+    body = combine([cube(4.2, 0.8, 1.8).transformed(t=(0, 0.6, 0)),
+                    cube(2.2, 0.6, 1.6).transformed(t=(-0.3, 1.3, 0))])
+    mesh = create_mesh(body, proto, parent=root, soften=0)
+    mat = FI.make_shader("lambert", "TrafficCar_mat")
+    cmds.setAttr(mat + ".color", 0.75, 0.2, 0.15, type="double3")
+    FI.assign(mesh, mat)
+    cmds.setAttr(mesh + ".visibility", 0)
+    return mesh
+
+
+def build_traffic(seconds=25.0, fps=24.0, inflow=0.4, clips=24, seed=7):
+    """씬 도로에 차선 맞추기 → 시뮬레이션 → 굽기"""
+    lanes = scene_lanes()
+    if not lanes:
+        raise RuntimeError("no road found (run FI.add_road_and_sidewalk first)")
+    sim = simulate([ln.length for ln in lanes], seconds, fps, inflow,
+                   rng=np.random.default_rng(seed))
+    cars, n_clips, (rms, worst) = bake(lanes, sim, clips)
+    print(f"{len(cars)} cars on {len(lanes)} lanes, {n_clips} shared clips, "
+          f"clip error rms {rms:.2f} m / max {worst:.2f} m")
+    return cars
+
+
+if __name__ == "__main__":
+    build_traffic()
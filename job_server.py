@@ -0,0 +1,264 @@
+import os
+import json
+import time
+import socket
+import hashlib
+import threading
+import socketserver
+
+#  씬 생성 잡 서버 (Maya 세션 하나를 계속 띄워 두고 요청을 받아 처리)
+#  - 로컬 소켓으로 JSON 잡 스펙을 한 줄씩 받음 → 큐에 넣고 메인 스레드가 처리
+#  - 같은 스펙은 합침: 대기/실행 중이면 같은 잡에 붙고, 이미 끝난 결과 파일이 있으면 바로 응답
+#  - 한 번에 쌓인 잡을 종류별로 묶어 처리 (fleet 먼저 → 프로토타입 재사용, scene 은 새 파일)
+#  - 차량 프로토타입은 숨겨 두고 잡마다 instance 로 배치
+#  - 결과는 out_dir 에 .mb + 같은 이름 .json (스펙, 상태, 시간)
+#
+#  프로토콜 (한 줄 = JSON 하나, 응답도 한 줄):
+#    {"type": "scene", "seed": 7}
+#    {"type": "fleet", "vehicle": "hovercar", "count": 20, "spacing": 6, "wait": true}
+#    {"op": "status", "id": "..."}
+#  테스트에서는 backend(maya.cmds 대신), builders(잡 종류별 빌더), prototypes(차량 빌더)를
+#  넘기면 Maya 없이 돈다 (maya.cmds 는 backend 를 안 넘길 때만 import) → tests/test_job_server.py
+
+HOST = "127.0.0.1"
+PORT = 7210
+
+PROTO_GRP = "JobServer_proto_grp"
+
+
+class Job(object):
+    def __init__(self, key, spec):
+        self.id = key
+        self.spec = spec
+        self.status = "queued"      # queued / running / done / failed
+        self.out = None
+        self.error = ""
+        self.seconds = 0.0
+        self.done = threading.Event()
+
+    def reply(self):
+        return {"id": self.id, "status": self.status, "out": self.out,
+                "error": self.error, "seconds": round(self.seconds, 3)}
+
+
+def job_key(spec):
+    """스펙 → 잡 id (응답 옵션은 빼고 정렬한 JSON 해시)"""
+    body = {k: v for k, v in spec.items() if k not in ("wait", "op")}
+    return hashlib.sha1(json.dumps(body, sort_keys=True).encode()).hexdigest()[:16]
+
+
+#  잡 종류별 빌더: build(server, spec) → 저장할 노드 목록 (None 이면 씬 전체 저장)
+def _build_scene(server, spec):
+    from build_pipeline import fi_pipeline
+
+    server.cmds.file(new=True, force=True)
+    server.protos.clear()                   # 새 파일 → 프로토타입도 사라짐
+    p = fi_pipeline()
+    p.stages["layout"].params["seed"] = spec.get("seed", 7)
+    p.run(force=True)
+    return None
+
+
+def _build_fleet(server, spec):
+    c = server.cmds
+    vehicle = spec.get("vehicle", "hovercar")
+    count = int(spec.get("count", 10))
+    spacing = float(spec.get("spacing", 6.0))
+    per_row = max(1, int(count ** 0.5 + 0.999))
+
+    proto = server.prototype(vehicle)
+    grp = c.group(em=True, name=f"Fleet_{vehicle}_grp")
+    for i in range(count):
+        inst = c.instance(proto, name=f"{vehicle}_{i + 1}")[0]
+        c.setAttr(inst + ".visibility", 1)
+        c.xform(inst, ws=True, t=((i % per_row) * spacing, 0, (i // per_row) * spacing))
+        c.parent(inst, grp)
+    return [grp]
+
+
+JOB_TYPES = {"scene": _build_scene, "fleet": _build_fleet}
+
+
+# 차량 프로토타입 빌더 () → 루트 트랜스폼
+def _proto_hovercar():
+    from mesh_builder import create_hovercar_fast
+    return create_hovercar_fast("Proto_HoverCar")[0]
+
+
+def _proto_taxi():
+    import FI
+    return FI.create_flying_taxi()
+
+
+PROTOTYPES = {"hovercar": _proto_hovercar, "taxi": _proto_taxi}
+
+
+class _TCPServer(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+
+class JobServer(object):
+    def __init__(self, out_dir="jobs_out", host=HOST, port=PORT, backend=None,
+                 builders=None, prototypes=None):
+        if backend is None:
+            import maya.cmds as backend
+        self.out_dir = os.path.abspath(out_dir)
+        self.host = host
+        self.port = port                # 0 이면 빈 포트 (start 후 실제 포트로 바뀜)
+        self.cmds = backend
+        self.builders = dict(JOB_TYPES, **(builders or {}))
+        self.prototypes = dict(PROTOTYPES, **(prototypes or {}))
+        self.jobs = {}              # id → Job (끝난 잡 포함, 결과 캐시)
+        self.pending = []
+        self.protos = {}            # vehicle → 프로토타입 루트
+        self.lock = threading.Lock()
+        self.wakeup = threading.Event()
+        self.gui = False
+        self._server = None
+
+    # ---------- 큐 ----------
+    def submit(self, spec):
+        """잡 등록 → Job (같은 스펙이 대기/실행 중이거나 결과가 남아 있으면 그 잡)"""
+        if spec.get("type") not in self.builders:
+            raise ValueError(f"unknown job type '{spec.get('type')}'")
+        key = job_key(spec)
+        with self.lock:
+            job = self.jobs.get(key)
+            if job and (job.status in ("queued", "running") or
+                        (job.status == "done" and os.path.exists(job.out))):
+                return job
+            job = Job(key, spec)
+            self.jobs[key] = job
+            self.pending.append(job)
+        self.wakeup.set()
+        if self.gui:
+            import maya.utils
+            maya.utils.executeDeferred(self.process)
+        return job
+
+    def prototype(self, vehicle):
+        """숨겨 둔 프로토타입 (씬에 없으면 새로 만듦)"""
+        c = self.cmds
+        node = self.protos.get(vehicle)
+        if node and c.objExists(node):
+            return node
+        if vehicle not in self.prototypes:
+            raise ValueError(f"unknown vehicle '{vehicle}'")
+        if not c.objExists(PROTO_GRP):
+            c.group(em=True, name=PROTO_GRP)
+            c.setAttr(PROTO_GRP + ".visibility", 0)
+        node = self.prototypes[vehicle]()
+        node = c.parent(node, PROTO_GRP)[0]
+        self.protos[vehicle] = node
+        return node
+
+    # ---------- 처리 (메인 스레드) ----------
+    def process(self):
+        """쌓인 잡을 한 번에 처리 → 처리한 잡 수"""
+        with self.lock:
+            batch, self.pending = self.pending, []
+            self.wakeup.clear()
+        # fleet 먼저 (프로토타입 공유), scene 은 새 파일을 열므로 뒤로
+        batch.sort(key=lambda j: (j.spec["type"] == "scene", j.spec["type"]))
+        for job in batch:
+            self._run(job)
+        return len(batch)
+
+    def _run(self, job):
+        c = self.cmds
+        job.status = "running"
+        t0 = time.perf_counter()
+        try:
+            nodes = self.builders[job.spec["type"]](self, job.spec)
+            os.makedirs(self.out_dir, exist_ok=True)
+            out = os.path.join(self.out_dir, f"{job.spec['type']}_{job.id}.mb")
+            if nodes is None:
+                c.file(rename=out)
+                c.file(save=True, force=True, type="mayaBinary")
+            else:
+                c.select(nodes, replace=True)
+                c.file(out, force=True, exportSelected=True, type="mayaBinary")
+                c.delete(nodes)
+            job.out = out
+            job.status = "done"
+        except Exception as e:
+            job.status = "failed"
+            job.error = f"{type(e).__name__}: {e}"
+        job.seconds = time.perf_counter() - t0
+
+        if job.out:
+            with open(os.path.splitext(job.out)[0] + ".json", "w") as f:
+                json.dump(dict(job.reply(), spec=job.spec), f, indent=2)
+        job.done.set()
+
+    # ---------- 네트워크 ----------
+    def handle(self, msg):
+        """요청 dict → 응답 dict (소켓 스레드에서 호출)"""
+        if msg.get("op") == "status":
+            job = self.jobs.get(msg.get("id"))
+            return job.reply() if job else {"id": msg.get("id"), "status": "unknown"}
+        job = self.submit(msg)
+        if msg.get("wait"):
+            job.done.wait()
+        return job.reply()
+
+    def start(self, gui=False):
+        """소켓 수신 스레드 시작. gui=True 면 잡마다 Maya 메인 스레드에서 process 예약"""
+        server = self
+        self.gui = gui
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                for line in self.rfile:
+                    if not line.strip():
+                        continue
+                    try:
+                        msg = json.loads(line)
+                        reply = server.handle(msg)
+                    except Exception as e:
+                        reply = {"status": "error", "error": f"{type(e).__name__}: {e}"}
+                    self.wfile.write((json.dumps(reply) + "\n").encode())
+
+        self._server = _TCPServer((self.host, self.port), Handler)
+        self.port = self._server.server_address[1]
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        print(f"job server on {self.host}:{self.port} → {self.out_dir}")
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def serve_forever(self, poll=0.5):
+        """mayapy 용: 메인 스레드에서 잡이 들어올 때마다 처리"""
+        self.start()
+        try:
+            while True:
+                if self.wakeup.wait(poll):
+                    self.process()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
+
+
+#  클라이언트 (다른 파이프라인 도구에서 사용, Maya 필요 없음)
+def request(msg, host=HOST, port=PORT, timeout=None):
+    with socket.create_connection((host, port), timeout=timeout) as s:
+        s.sendall((json.dumps(msg) + "\n").encode())
+        return json.loads(s.makefile().readline())
+
+
+if __name__ == "__main__":
+    import argparse
+
+    p = argparse.ArgumentParser(description="FI.py 씬/차량 생성 잡 서버 (mayapy)")
+    p.add_argument("--out", default="jobs_out")
+    p.add_argument("--port", type=int, default=PORT)
+    args = p.parse_args()
+
+    import maya.standalone
+    maya.standalone.initialize()
+    JobServer(args.out, port=args.port).serve_forever()
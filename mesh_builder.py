@@ -0,0 +1,253 @@
+import math
+import numpy as np
+
+import maya.cmds as cmds
+import maya.api.OpenMaya as om
+
+import FI
+
+#  정점 배열로 바로 메쉬 만들기
+#  - polySphere/polyCube/... + scale/move/rotate (+ polySmooth) 대신
+#    프리미티브의 정점/면/UV 배열을 numpy 로 만들고 변환까지 미리 적용
+#  - 같은 재질 파츠는 배열을 이어 붙여 MFnMesh.create 한 번으로 생성 (history 노드 없음)
+#  - 프리미티브 규칙(축, 분할, 크기)은 Maya 기본 프리미티브와 같게 맞춤
+
+
+class Prim(object):
+    """메쉬 배열 묶음: points (n, 3), counts (f,), connects, u/v, uv_ids"""
+
+    def __init__(self, points, counts, connects, u, v, uv_ids):
+        self.points = np.asarray(points, dtype=float)
+        self.counts = np.asarray(counts, dtype=int)
+        self.connects = np.asarray(connects, dtype=int)
+        self.u = np.asarray(u, dtype=float)
+        self.v = np.asarray(v, dtype=float)
+        self.uv_ids = np.asarray(uv_ids, dtype=int)
+
+    def transformed(self, t=(0, 0, 0), r=(0, 0, 0), s=(1, 1, 1)):
+        """Maya 순서(scale → rotate xyz → translate)로 변환한 복사본"""
+        return Prim(self.points * s @ rotation_xyz(*r) + t, self.counts, self.connects,
+                    self.u, self.v, self.uv_ids)
+
+
+def rotation_xyz(rx, ry, rz):
+    """rotateOrder xyz 회전 행렬 (행벡터 p @ M)"""
+    x, y, z = np.radians([rx, ry, rz])
+    cx, sx, cy, sy, cz, sz = math.cos(x), math.sin(x), math.cos(y), math.sin(y), math.cos(z), math.sin(z)
+    mx = np.array([[1, 0, 0], [0, cx, sx], [0, -sx, cx]])
+    my = np.array([[cy, 0, -sy], [0, 1, 0], [sy, 0, cy]])
+    mz = np.array([[cz, sz, 0], [-sz, cz, 0], [0, 0, 1]])
+    return mx @ my @ mz
+
+
+def combine(prims):
+    """여러 Prim 을 인덱스 오프셋 붙여 하나로"""
+    offs = np.cumsum([0] + [len(p.points) for p in prims[:-1]])
+    uv_offs = np.cumsum([0] + [len(p.u) for p in prims[:-1]])
+    return Prim(np.concatenate([p.points for p in prims]),
+                np.concatenate([p.counts for p in prims]),
+                np.concatenate([p.connects + o for p, o in zip(prims, offs)]),
+                np.concatenate([p.u for p in prims]),
+                np.concatenate([p.v for p in prims]),
+                np.concatenate([p.uv_ids + o for p, o in zip(prims, uv_offs)]))
+
+
+def _uv_grid(nu, nv):
+    """(nv + 1) x (nu + 1) UV 격자, 인덱스 = j * (nu + 1) + i"""
+    u, v = np.meshgrid(np.arange(nu + 1) / nu, np.arange(nv + 1) / nv)
+    return u.ravel(), v.ravel()
+
+
+def _quads(nu, nv, wrap_u, vid, uvid):
+    """격자 (i, j) 사각형들의 정점/UV 인덱스 (바깥쪽이 앞면인 순서)"""
+    i, j = np.meshgrid(np.arange(nu), np.arange(nv))
+    i, j = i.ravel(), j.ravel()
+    i1 = (i + 1) % nu if wrap_u else i + 1
+    conn = np.stack([vid(i, j), vid(i1, j), vid(i1, j + 1), vid(i, j + 1)], axis=1)
+    uvs = np.stack([uvid(i, j), uvid(i + 1, j), uvid(i + 1, j + 1), uvid(i, j + 1)], axis=1)
+    return conn, uvs
+
+
+#  프리미티브 (Maya 기본값과 같은 축/분할)
+def sphere(r=1.0, sx=20, sy=20):
+    theta = 2 * math.pi * np.arange(sx) / sx
+    phi = math.pi * np.arange(1, sy) / sy
+    ring = np.stack([np.outer(np.sin(phi), np.cos(theta)),
+                     np.repeat(-np.cos(phi), sx).reshape(sy - 1, sx),
+                     -np.outer(np.sin(phi), np.sin(theta))], axis=-1).reshape(-1, 3)
+    points = np.vstack([[0, -1, 0], ring, [0, 1, 0]]) * r
+    top = len(points) - 1
+
+    def vid(i, j):          # j: 0..sy-2 링
+        return 1 + j * sx + i % sx
+
+    def uvid(i, j):
+        return (j + 1) * (sx + 1) + i
+
+    u, v = _uv_grid(sx, sy)
+    conn, uvs = _quads(sx, sy - 2, True, vid, uvid)
+
+    i = np.arange(sx)
+    bottom = np.stack([np.zeros(sx, int), vid(i + 1, 0), vid(i, 0)], axis=1)
+    bottom_uv = np.stack([i, uvid(i + 1, 0), uvid(i, 0)], axis=1)
+    cap = np.stack([vid(i, sy - 2), vid(i + 1, sy - 2), np.full(sx, top)], axis=1)
+    cap_uv = np.stack([uvid(i, sy - 2), uvid(i + 1, sy - 2), sy * (sx + 1) + i], axis=1)
+
+    counts = np.r_[np.full(sx, 3), np.full(len(conn), 4), np.full(sx, 3)]
+    return Prim(points, counts, np.r_[bottom.ravel(), conn.ravel(), cap.ravel()],
+                u, v, np.r_[bottom_uv.ravel(), uvs.ravel(), cap_uv.ravel()])
+
+
+def cube(w=1.0, h=1.0, d=1.0):
+    points = np.array([[x, y, z] for y in (-0.5, 0.5) for z in (0.5, -0.5)
+                       for x in (-0.5, 0.5)]) * (w, h, d)
+    faces = [[0, 1, 5, 4], [4, 5, 7, 6], [6, 7, 3, 2], [2, 3, 1, 0], [1, 3, 7, 5], [2, 0, 4, 6]]
+    u = np.tile([0.0, 1.0, 1.0, 0.0], 6)
+    v = np.tile([0.0, 0.0, 1.0, 1.0], 6)
+    return Prim(points, [4] * 6, np.ravel(faces), u, v, np.arange(24))
+
+
+def cylinder(r=1.0, h=2.0, sx=20):
+    theta = 2 * math.pi * np.arange(sx) / sx
+    circle = np.stack([np.cos(theta), np.zeros(sx), -np.sin(theta)], axis=1) * r
+    points = np.vstack([circle + (0, -h / 2, 0), circle + (0, h / 2, 0)])
+
+    side, side_uv = _quads(sx, 1, True, lambda i, j: j * sx + i % sx,
+                           lambda i, j: j * (sx + 1) + i)
+    u, v = _uv_grid(sx, 1)
+
+    # 캡: n각형 면, UV 는 원형 투영
+    cu = 0.5 + 0.5 * np.cos(theta)
+    cv = 0.5 - 0.5 * np.sin(theta)
+    base = len(u)
+    i = np.arange(sx)
+    bottom = i[::-1]
+    top = sx + i
+    return Prim(points, np.r_[np.full(sx, 4), sx, sx],
+                np.r_[side.ravel(), bottom, top],
+                np.r_[u, cu, cu], np.r_[v, cv, cv],
+                np.r_[side_uv.ravel(), base + i[::-1], base + sx + i])
+
+
+def torus(r=1.0, sr=0.5, sx=20, sy=20):
+    theta = 2 * math.pi * np.arange(sx) / sx
+    psi = 2 * math.pi * np.arange(sy) / sy
+    rho = r + sr * np.cos(psi)[:, None]
+    points = np.stack([rho * np.cos(theta), np.repeat(sr * np.sin(psi), sx).reshape(sy, sx),
+                       -rho * np.sin(theta)], axis=-1).reshape(-1, 3)
+
+    conn, uvs = _quads(sx, sy, True, lambda i, j: (j % sy) * sx + i % sx,
+                       lambda i, j: j * (sx + 1) + i)
+    u, v = _uv_grid(sx, sy)
+    return Prim(points, np.full(len(conn), 4), conn.ravel(), u, v, uvs.ravel())
+
+
+def plane(w=1.0, h=1.0, sx=10, sy=10):
+    x, z = np.meshgrid(np.linspace(-w / 2, w / 2, sx + 1), np.linspace(h / 2, -h / 2, sy + 1))
+    points = np.stack([x.ravel(), np.zeros(x.size), z.ravel()], axis=1)
+    conn, uvs = _quads(sx, sy, False, lambda i, j: j * (sx + 1) + i,
+                       lambda i, j: j * (sx + 1) + i)
+    u, v = _uv_grid(sx, sy)
+    return Prim(points, np.full(len(conn), 4), conn.ravel(), u, v, uvs.ravel())
+
+
+#  Maya 노드 생성
+def create_mesh(prim, name, parent=None, soften=60):
+    """Prim → 메쉬 (MFnMesh.create 한 번), 트랜스폼 이름 반환"""
+    fn = om.MFnMesh()
+    xform = fn.create(om.MPointArray(prim.points.tolist()),
+                      prim.counts.tolist(), prim.connects.tolist(),
+                      prim.u.tolist(), prim.v.tolist())
+    fn.assignUVs(prim.counts.tolist(), prim.uv_ids.tolist())
+
+    node = om.MFnDagNode(xform).fullPathName()
+    node = cmds.rename(node, name)
+    if soften:
+        # 곡면은 부드럽게, 박스 모서리는 각지게
+        cmds.polySoftEdge(node, angle=soften, constructionHistory=False)
+    if parent:
+        node = cmds.parent(node, parent)[0]
+    return node
+
+
+#  HoverCar (FI.create_hovercar_v9_1 과 같은 형태/배치)
+_HOVERCAR_PARTS = {}
+
+
+def hovercar_parts():
+    """재질별로 합친 파츠 Prim (한 번 계산해서 모든 차량이 공유)
+
+    body 의 polySmooth(dv=1)는 분할 수를 두 배로 한 구로 대신한다.
+    """
+    if _HOVERCAR_PARTS:
+        return _HOVERCAR_PARTS
+
+    hull = [sphere(1.0, 80, 40).transformed(t=(0, 1.2, 0), s=(2.2, 0.55, 1.2))]
+    glass = [cube(1.0, 0.25, 0.5).transformed(t=(0.3, 1.55, 0), r=(-10, -90, 0))]
+    plain = [cube(0.8, 0.2, 0.8).transformed(t=(-0.2, 1.2, 0), r=(0, -90, 0)),
+             cube(0.8, 0.45, 0.15).transformed(t=(-0.6, 1.45, 0), r=(0, -90, 0))]
+    metal, glow = [], []
+    for side in (-1, 1):
+        metal.append(sphere(0.5, 30, 20).transformed(t=(0.3, 1.1, side * 1.25),
+                                                     s=(2.2, 0.55, 0.55)))
+        metal.append(torus(0.52, 0.05).transformed(t=(1.1, 1.1, side * 1.25), r=(0, 90, 0)))
+        glow.append(torus(0.32, 0.06).transformed(t=(-0.55, 1.1, side * 1.25), r=(0, 90, 0)))
+    for pos in [(-0.6, 0.7, 0.6), (0.6, 0.7, 0.6), (-0.6, 0.7, -0.6), (0.6, 0.7, -0.6)]:
+        glow.append(cylinder(0.25, 0.12, 20).transformed(t=pos))
+
+    _HOVERCAR_PARTS.update(Hull=combine(hull), Glass=combine(glass), Seat=combine(plain),
+                           Metal=combine(metal), Glow=combine(glow))
+    return _HOVERCAR_PARTS
+
+
+def _hovercar_materials(name):
+    hull = FI.make_shader("blinn", name + "_Hull")
+    cmds.setAttr(hull + ".color", 0.7, 0.9, 1.0, type="double3")
+    cmds.setAttr(hull + ".transparency", 0.55, 0.55, 0.55, type="double3")
+
+    glass = FI.make_shader("blinn", name + "_Glass")
+    cmds.setAttr(glass + ".color", 0.2, 0.4, 1.0, type="double3")
+    cmds.setAttr(glass + ".transparency", 0.7, 0.7, 0.7, type="double3")
+
+    metal = FI.make_shader("blinn", name + "_Metal")
+    cmds.setAttr(metal + ".color", 0.6, 0.6, 0.63, type="double3")
+
+    glow = FI.make_shader("lambert", name + "_Glow")
+    cmds.setAttr(glow + ".color", 0.1, 0.8, 1.0, type="double3")
+    cmds.setAttr(glow + ".incandescence", 0.2, 0.9, 1.0, type="double3")
+
+    return {"Hull": hull, "Glass": glass, "Metal": metal, "Glow": glow, "Seat": None}
+
+
+def create_hovercar_fast(name="HoverCar"):
+    """create_hovercar_v9_1 과 같은 반환값 (root, glow 리스트), 재질당 메쉬 하나"""
+    if cmds.objExists(name):
+        cmds.delete(name)
+
+    root = cmds.group(em=True, name=name)
+    mats = _hovercar_materials(name)
+
+    meshes = {}
+    for key, prim in hovercar_parts().items():
+        meshes[key] = create_mesh(prim, f"{name}_{key}_geo", parent=root)
+        if mats[key]:
+            FI.assign(meshes[key], mats[key])
+        else:
+            # FI 원본에서도 시트/등받이는 기본 재질
+            cmds.sets(meshes[key], e=True, forceElement="initialShadingGroup")
+
+    cmds.xform(root, centerPivots=True)
+    return root, [meshes["Glow"]]
+
+
+if __name__ == "__main__":
+    import time
+
+    t0 = time.perf_counter()
+    for i in range(20):
+        FI.create_hovercar_v9_1(f"SlowCar_{i}")
+    t1 = time.perf_counter()
+    for i in range(20):
+        create_hovercar_fast(f"FastCar_{i}")
+    t2 = time.perf_counter()
+    print(f"cmds chain {t1 - t0:.3f}s / vertex arrays {t2 - t1:.3f}s (20 cars)")
@@ -0,0 +1,155 @@
+from contextlib import contextmanager
+
+import maya.cmds as cmds
+import maya.api.OpenMaya as om
+
+#  노드 핸들 캐시
+#  - 이름 → MObjectHandle, (이름, 속성) → MPlug 를 메모리에 들고 있다가
+#    존재 확인 / 속성 읽기·쓰기 / 연결을 DAG 경로 검색 없이 처리
+#  - 처음 보는 이름만 MSelectionList 로 한 번 찾고, 그 뒤로는 핸들 유효성만 확인
+#  - 노드가 지워지거나 이름이 바뀌면 핸들 검사에서 걸러져 다시 찾음
+#  - recording() 안에서 만들어진 노드는 생성 시점의 MObject 로 바로 등록
+#  - 값 쓰기는 MPlug 직접 (undo 안 됨 → 빌드용)
+
+
+class NodeRegistry(object):
+    def __init__(self):
+        self._handles = {}      # 이름 → MObjectHandle
+        self._plugs = {}        # (이름, 속성) → MPlug
+
+    # ---------- 노드 ----------
+    def _valid(self, name, handle):
+        if not handle.isValid():
+            return False
+        # 다른 이름으로 바뀌었으면 무효 (짧은 이름끼리 비교, 경로 검색 없음)
+        return om.MFnDependencyNode(handle.object()).name() == name.rsplit("|", 1)[-1]
+
+    def node(self, name):
+        """이름 → MObject (없으면 None, 여러 노드와 겹치면 ValueError — cmds 와 같이)"""
+        h = self._handles.get(name)
+        if h is not None:
+            if self._valid(name, h):
+                return h.object()
+            self.forget(name)
+
+        sel = om.MSelectionList()
+        try:
+            sel.add(name)
+        except RuntimeError:
+            return None
+        if sel.length() > 1:
+            raise ValueError(f"more than one object matches name '{name}'")
+        obj = sel.getDependNode(0)
+        self._handles[name] = om.MObjectHandle(obj)
+        return obj
+
+    def exists(self, name):
+        """objExists 처럼 이름이 겹쳐도 True"""
+        try:
+            return self.node(name) is not None
+        except ValueError:
+            return True
+
+    def register(self, node):
+        """MObject 또는 이름 → 등록된 이름 (DAG 노드가 이름이 겹치면 전체 경로)"""
+        obj = node if isinstance(node, om.MObject) else self.node(node)
+        if obj is None:
+            raise ValueError(f"no node '{node}'")
+        name = om.MFnDependencyNode(obj).name()
+        if obj.hasFn(om.MFn.kDagNode) and not om.MFnDagNode(obj).hasUniqueName():
+            name = om.MFnDagNode(obj).fullPathName()
+        self._handles[name] = om.MObjectHandle(obj)
+        return name
+
+    def forget(self, name):
+        self._handles.pop(name, None)
+        for key in [k for k in self._plugs if k[0] == name]:
+            del self._plugs[key]
+
+    def path(self, name):
+        """cmds 에 넘길 이름 (DAG 노드는 현재 전체 경로)"""
+        obj = self.node(name)
+        if obj is None:
+            raise ValueError(f"no node '{name}'")
+        if obj.hasFn(om.MFn.kDagNode):
+            return om.MFnDagNode(obj).fullPathName()
+        return om.MFnDependencyNode(obj).name()
+
+    def uuid(self, name):
+        return om.MFnDependencyNode(self.node(name)).uuid().asString()
+
+    # ---------- 속성 ----------
+    def plug(self, name, attr):
+        """캐시된 MPlug (노드가 유효한지만 확인)"""
+        obj = self.node(name)
+        if obj is None:
+            raise ValueError(f"no node '{name}'")
+        key = (name, attr)
+        p = self._plugs.get(key)
+        if p is None:
+            p = om.MFnDependencyNode(obj).findPlug(attr, False)
+            self._plugs[key] = p
+        return p
+
+    def set(self, name, attr, *values):
+        """setAttr 대신: 숫자 하나, 또는 compound(double3 등)는 자식 순서대로"""
+        p = self.plug(name, attr)
+        if p.isCompound:
+            for i, v in enumerate(values):
+                p.child(i).setDouble(float(v))
+        elif isinstance(values[0], str):
+            p.setString(values[0])
+        elif isinstance(values[0], bool):
+            p.setBool(values[0])
+        else:
+            p.setDouble(float(values[0]))
+
+    def get(self, name, attr):
+        p = self.plug(name, attr)
+        if p.isCompound:
+            return tuple(p.child(i).asDouble() for i in range(p.numChildren()))
+        return p.asDouble()
+
+    def connect(self, src, src_attr, dst, dst_attr, force=False):
+        a, b = self.plug(src, src_attr), self.plug(dst, dst_attr)
+        mod = om.MDGModifier()
+        if b.isDestination:
+            if not force:
+                raise RuntimeError(f"{dst}.{dst_attr} is already connected")
+            mod.disconnect(b.source(), b)
+        mod.connect(a, b)
+        mod.doIt()
+
+    def assign(self, objs, sg):
+        """select + hyperShade(assign) 대신: 등록된 경로로 바로 SG 에 넣음"""
+        if not isinstance(objs, (list, tuple)):
+            objs = [objs]
+        cmds.sets([self.path(o) for o in objs], e=True, forceElement=self.path(sg))
+
+    # ---------- 생성 기록 ----------
+    @contextmanager
+    def recording(self):
+        """블록 안에서 생성된 노드를 모두 등록 → 블록이 끝나면 names 에 이름이 채워짐"""
+        created = []
+        names = []
+
+        def added(obj, *args):
+            created.append(om.MObjectHandle(obj))
+
+        cb = om.MDGMessage.addNodeAddedCallback(added, "dependNode")
+        try:
+            yield names
+        finally:
+            om.MMessage.removeCallback(cb)
+            # 생성 직후 이름은 임시 이름일 수 있어서(name= 플래그) 끝난 뒤 현재 이름으로 등록
+            for h in created:
+                if h.isValid():
+                    names.append(self.register(h.object()))
+
+    def clear(self):
+        self._handles.clear()
+        self._plugs.clear()
+
+
+# 빌더들이 같이 쓰는 레지스트리 (지워진/새 씬 노드는 핸들 검사에서 걸러짐)
+REGISTRY = NodeRegistry()
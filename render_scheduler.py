@@ -0,0 +1,225 @@
+import os
+import re
+import sys
+import time
+import shutil
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+#  프레임 분할 렌더 / 플레이블라스트 스케줄러
+#  - FI.py 씬 준비는 mayapy로 한 번만 실행 → .mb 저장
+#  - 저장된 씬을 모든 워커(청크)가 공유
+#  - 청크마다 독립 프로세스로 렌더러 커맨드 실행, 실패 시 재시도
+#    (playblast 는 뷰포트가 있어야 해서 청크마다 GUI Maya, 화면(디스플레이)이 있는 머신에서)
+#  - 끝나면 청크 결과를 프레임 순서대로 하나의 폴더에 이어 붙임
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# 커맨드 템플릿: {scene} {start} {end} {out} {chunk} 치환
+# 파일 이름 프레임 번호는 4자리로 (기본 extensionPadding=1 이면 x.1, x.10, x.2 ... 순서가 섞임)
+# 렌더러는 Arnold: 건물 색은 공용 셰이더가 colorSet 을 aiUserDataColor 로 읽어서 나옴
+# (hw2 / sw 는 colorSet 을 안 읽어서 모든 건물이 한 색)
+RENDER_CMD = ["Render", "-r", "arnold", "-s", "{start}", "-e", "{end}", "-pad", "4",
+              "-rd", "{out}", "{scene}"]
+
+# playblast 는 뷰포트가 필요해서 mayapy(standalone)에서는 실패 → GUI Maya 를 청크마다 띄움
+# (씬을 연 뒤 -command 로 playblast_chunk 실행, 끝나면 종료 코드와 함께 Maya 종료)
+PLAYBLAST_CMD = [
+    "maya", "-file", "{scene}", "-command",
+    "python(\"import sys; sys.path.insert(0, '%s'); import render_scheduler;"
+    " render_scheduler.playblast_chunk({start}, {end}, '{out}')\")" % HERE.replace(os.sep, "/"),
+]
+
+# FI.py 가 같은 폴더의 모듈(node_registry 등)을 import 하므로 저장소 폴더를 sys.path 에
+PREP_SCRIPT = (
+    "import sys; sys.path.insert(0, r'{here}');"
+    "import maya.standalone; maya.standalone.initialize();"
+    "import maya.cmds as cmds;"
+    "cmds.loadPlugin('mtoa', quiet=True);"
+    "exec(open(r'{script}').read(), {{'__name__': '__main__'}});"
+    "cmds.file(rename=r'{scene}');"
+    "cmds.file(save=True, type='mayaBinary')"
+)
+
+
+def split_frames(start, end, chunk_size):
+    """[start, end] 구간을 chunk_size 프레임씩 나눈 (s, e) 리스트"""
+    chunks = []
+    s = start
+    while s <= end:
+        e = min(s + chunk_size - 1, end)
+        chunks.append((s, e))
+        s = e + 1
+    return chunks
+
+
+def prepare_scene(scene_path, script=os.path.join(HERE, "FI.py"), mayapy="mayapy"):
+    """FI.py를 한 번만 실행해서 공유 씬 저장 (스크립트보다 최신이면 재사용)"""
+    if os.path.exists(scene_path) and os.path.getmtime(scene_path) >= os.path.getmtime(script):
+        return scene_path
+
+    os.makedirs(os.path.dirname(os.path.abspath(scene_path)), exist_ok=True)
+    code = PREP_SCRIPT.format(here=HERE, script=script, scene=scene_path)
+    subprocess.run([mayapy, "-c", code], check=True)
+    return scene_path
+
+
+def playblast_chunk(start, end, out):
+    """GUI Maya 안에서 실행 (PLAYBLAST_CMD): 열린 씬을 playblast 하고 종료 코드로 결과 전달"""
+    import maya.cmds as cmds
+
+    code = 0
+    try:
+        cmds.playblast(startTime=start, endTime=end, format="image", compression="png",
+                       filename=os.path.join(out, "frame"), viewer=False,
+                       showOrnaments=False, percent=100, framePadding=4, forceOverwrite=True)
+    except Exception as e:
+        print(f"playblast failed: {e}")
+        code = 1
+    cmds.quit(force=True, exitCode=code)
+
+
+_FRAME_RE = re.compile(r"(\d+)(?=\.[^.]*$|$)")
+
+
+def _frame_key(name):
+    """파일 이름의 마지막 숫자(프레임 번호) 기준 정렬 키 — 자리수 패딩이 없어도 순서 유지"""
+    m = _FRAME_RE.search(name)
+    return (int(m.group(1)) if m else -1, name)
+
+
+def _files(out_dir):
+    return sorted((f for f in os.listdir(out_dir)
+                   if os.path.isfile(os.path.join(out_dir, f))), key=_frame_key)
+
+
+def run_chunk(cmd_template, chunk_id, frames, scene, out_dir, retries=2):
+    """청크 하나 실행 (실패하면 retries번까지 재시도) → 결과 dict
+
+    종료 코드가 0 이어도 결과 파일 수가 프레임 수와 다르면 실패로 보고 재시도
+    (모자란 채로 이어 붙이면 뒤 프레임 번호가 밀림)
+    """
+    start, end = frames
+    # MEL 문자열 안에도 들어가므로 경로 구분자는 / 로
+    cmd = [c.format(scene=scene.replace(os.sep, "/"), start=start, end=end,
+                    out=out_dir.replace(os.sep, "/"), chunk=chunk_id)
+           for c in cmd_template]
+
+    info = {"chunk": chunk_id, "frames": frames, "out": out_dir,
+            "attempts": 0, "ok": False, "seconds": 0.0, "error": ""}
+
+    t0 = time.perf_counter()
+    for attempt in range(retries + 1):
+        info["attempts"] = attempt + 1
+        # 재시도 시 이전 시도의 잔여 파일 제거
+        if os.path.isdir(out_dir):
+            shutil.rmtree(out_dir)
+        os.makedirs(out_dir)
+
+        proc = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+        if proc.returncode != 0:
+            info["error"] = (proc.stdout or "").strip()[-500:]
+            continue
+        count = len(_files(out_dir))
+        if count != end - start + 1:
+            info["error"] = f"{count} files for {end - start + 1} frames"
+            continue
+        info["ok"] = True
+        info["error"] = ""
+        break
+
+    info["seconds"] = time.perf_counter() - t0
+    return info
+
+
+def stitch_outputs(results, dest_dir, prefix="frame"):
+    """청크 결과 파일을 프레임 순서대로 dest_dir에 prefix.0001.ext 형태로 모음"""
+    os.makedirs(dest_dir, exist_ok=True)
+    written = []
+
+    for info in sorted(results, key=lambda r: r["frames"][0]):
+        start, end = info["frames"]
+        files = _files(info["out"])
+        if len(files) != end - start + 1:
+            raise RuntimeError(f"chunk {info['chunk']}: {len(files)} files "
+                               f"for {end - start + 1} frames")
+
+        for frame, f in zip(range(start, end + 1), files):
+            ext = os.path.splitext(f)[1]
+            dst = os.path.join(dest_dir, f"{prefix}.{frame:04d}{ext}")
+            shutil.move(os.path.join(info["out"], f), dst)
+            written.append(dst)
+
+    return written
+
+
+def print_report(results, wall):
+    print("chunk   frames        attempts  seconds  status")
+    for r in sorted(results, key=lambda r: r["chunk"]):
+        s, e = r["frames"]
+        status = "ok" if r["ok"] else "FAILED"
+        print(f"{r['chunk']:>5}   {s:>4}-{e:<4}     {r['attempts']:>3}     "
+              f"{r['seconds']:>7.2f}  {status}")
+    total = sum(r["seconds"] for r in results)
+    print(f"wall {wall:.2f}s / chunk total {total:.2f}s "
+          f"(x{total / wall if wall else 0:.1f})")
+
+
+def schedule(cmd_template, scene, start=1, end=600, chunk_size=50,
+             workers=None, retries=2, work_dir="render_chunks",
+             dest_dir="render_out", prefix="frame"):
+    """프레임 범위를 청크로 나눠 병렬 실행 → 이어 붙이고 리포트 출력
+
+    워커는 스레드지만 실제 작업은 각자 별도 프로세스(subprocess)에서 돈다.
+    """
+    workers = workers or os.cpu_count() or 1
+    chunks = split_frames(start, end, chunk_size)
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(run_chunk, cmd_template, i, frames, scene,
+                               os.path.join(work_dir, f"chunk_{i:03d}"), retries)
+                   for i, frames in enumerate(chunks)]
+        results = [f.result() for f in futures]
+    wall = time.perf_counter() - t0
+
+    print_report(results, wall)
+
+    failed = [r for r in results if not r["ok"]]
+    if failed:
+        for r in failed:
+            print(f"chunk {r['chunk']} {r['frames']} failed:\n{r['error']}")
+        raise RuntimeError(f"{len(failed)} chunk(s) failed")
+
+    written = stitch_outputs(results, dest_dir, prefix)
+    shutil.rmtree(work_dir, ignore_errors=True)
+    return written, results
+
+
+if __name__ == "__main__":
+    import argparse
+
+    p = argparse.ArgumentParser(description="FI.py 씬 프레임 분할 렌더")
+    p.add_argument("--mode", choices=("render", "playblast"), default="render")
+    p.add_argument("--scene", default=os.path.join(HERE, "build", "FI_scene.mb"))
+    p.add_argument("--start", type=int, default=1)
+    p.add_argument("--end", type=int, default=600)
+    p.add_argument("--chunk", type=int, default=50)
+    p.add_argument("--workers", type=int, default=None)
+    p.add_argument("--retries", type=int, default=2)
+    p.add_argument("--out", default="render_out")
+    p.add_argument("--mayapy", default="mayapy")
+    p.add_argument("--maya", default="maya", help="playblast 용 GUI Maya 실행 파일")
+    args = p.parse_args()
+
+    scene = prepare_scene(args.scene, mayapy=args.mayapy)
+    template = RENDER_CMD if args.mode == "render" else PLAYBLAST_CMD
+    if args.mode == "playblast":
+        template = [args.maya] + template[1:]
+
+    try:
+        schedule(template, scene, args.start, args.end, args.chunk,
+                 args.workers, args.retries, dest_dir=args.out)
+    except RuntimeError as e:
+        print(e)
+        sys.exit(1)
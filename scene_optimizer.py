@@ -0,0 +1,192 @@
+import maya.cmds as cmds
+
+#  빌드 후 씬 최적화
+#  - 완성된 지오메트리의 construction history 삭제 (polySmooth, polyCube 등)
+#  - 같은 재질을 쓰는 정적 메쉬 합치기 (ExtraLine_*, 창문 등 / 숨김·instance 는 제외)
+#  - 재실행으로 남은 고아 셰이더/SG 정리 (HoverCar_1_Hull1 ...)
+#  - 전/후 노드 수, 메쉬 수, 메모리 리포트
+
+DEFAULT_NODES = {"lambert1", "standardSurface1", "particleCloud1",
+                 "initialShadingGroup", "initialParticleSE"}
+
+# 이 속성 중 하나라도 애니메이션/연결이 있으면 "움직이는" 트랜스폼
+XFORM_ATTRS = ("translateX", "translateY", "translateZ",
+               "rotateX", "rotateY", "rotateZ",
+               "scaleX", "scaleY", "scaleZ", "visibility")
+
+
+def scene_stats():
+    """노드/메쉬/폴리곤 수와 힙 메모리(MB)"""
+    meshes = cmds.ls(type="mesh", noIntermediate=True) or []
+    faces = cmds.polyEvaluate(meshes, face=True) if meshes else 0
+    try:
+        mem = cmds.memory(heapMemory=True, megaByte=True)
+    except RuntimeError:
+        mem = 0.0
+    return {"nodes": len(cmds.ls() or []),
+            "meshes": len(meshes),
+            "faces": faces if isinstance(faces, int) else 0,
+            "shadingEngines": len(cmds.ls(type="shadingEngine") or []),
+            "memoryMB": mem}
+
+
+def print_stats(before, after):
+    print("%-16s %10s %10s" % ("", "before", "after"))
+    for k in before:
+        print("%-16s %10s %10s" % (k, round(before[k], 1), round(after[k], 1)))
+
+
+def _mesh_transforms(roots=None):
+    shapes = cmds.ls(roots, dag=True, type="mesh", noIntermediate=True, long=True) \
+        if roots else cmds.ls(type="mesh", noIntermediate=True, long=True)
+    xforms = cmds.listRelatives(shapes or [], parent=True, fullPath=True) or []
+    return sorted(set(xforms))
+
+
+def _has_deformer(xform):
+    hist = cmds.listHistory(xform, pruneDagObjects=True) or []
+    return bool(cmds.ls(hist, type="geometryFilter"))
+
+
+def _is_animated(node):
+    """node 또는 조상 중 하나라도 키/표현식/연결로 움직이면 True"""
+    path = cmds.ls(node, long=True)[0]
+    parts = path.split("|")
+    for i in range(2, len(parts) + 1):
+        n = "|".join(parts[:i])
+        for attr in XFORM_ATTRS:
+            if cmds.listConnections(f"{n}.{attr}", source=True, destination=False):
+                return True
+    return False
+
+
+def _ancestors(node):
+    """node 와 조상 트랜스폼 전체 경로 (위에서부터)"""
+    parts = cmds.ls(node, long=True)[0].split("|")
+    return ["|".join(parts[:i]) for i in range(2, len(parts) + 1)]
+
+
+def _is_hidden(node):
+    """node 또는 조상 중 하나라도 숨겨져 있으면 True (숨긴 프로토타입 등)"""
+    return any(not cmds.getAttr(n + ".visibility") for n in _ancestors(node))
+
+
+def _is_instanced(xform):
+    """shape 또는 조상 트랜스폼이 instance (부모가 여럿) 이면 True"""
+    nodes = _ancestors(xform)
+    nodes += cmds.listRelatives(xform, shapes=True, fullPath=True) or []
+    return any(len(cmds.listRelatives(n, allParents=True) or []) > 1 for n in nodes)
+
+
+def delete_history(roots=None):
+    """디포머가 없는 메쉬의 construction history 삭제"""
+    targets = [x for x in _mesh_transforms(roots) if not _has_deformer(x)]
+    if targets:
+        cmds.delete(targets, constructionHistory=True)
+    return targets
+
+
+def _shading_engine(xform):
+    shapes = cmds.listRelatives(xform, shapes=True, noIntermediate=True, fullPath=True) or []
+    sgs = cmds.listConnections(shapes, type="shadingEngine") or []
+    sgs = sorted(set(sgs))
+    # 면 단위로 여러 재질이 붙은 메쉬는 합치지 않음
+    return sgs[0] if len(sgs) == 1 else None
+
+
+def merge_static_meshes(roots=None, min_count=2):
+    """같은 SG를 쓰는 정적 메쉬를 SG별로 하나로 합침 → {sg: merged}
+
+    숨긴 메쉬(자신/조상)와 instance 는 제외 — 숨긴 프로토타입(JobServer_proto_grp,
+    변형/교통 프로토타입)이 보이는 복제본과 SG 를 같이 써도 합쳐지지 않도록
+    """
+    groups = {}
+    for x in _mesh_transforms(roots):
+        if _is_animated(x) or _has_deformer(x) or _is_hidden(x) or _is_instanced(x):
+            continue
+        sg = _shading_engine(x)
+        if sg:
+            groups.setdefault(sg, []).append(x)
+
+    merged = {}
+    for sg, meshes in groups.items():
+        if len(meshes) < min_count:
+            continue
+
+        parents = {(cmds.listRelatives(m, parent=True, fullPath=True) or [None])[0]
+                   for m in meshes}
+        name = sg.replace("_SG", "") + "_merged_geo"
+
+        result = cmds.polyUnite(meshes, ch=False, mergeUVSets=1, name=name)[0]
+        cmds.sets(result, e=True, forceElement=sg)
+
+        # 모두 같은 부모였으면 원래 자리로 (polyUnite 결과는 월드 기준)
+        parent = parents.pop() if len(parents) == 1 else None
+        if parent and cmds.objExists(parent):
+            result = cmds.parent(result, parent)[0]
+
+        # ch=False여도 빈 트랜스폼이 남는 경우가 있어 정리
+        leftovers = [m for m in meshes if cmds.objExists(m)]
+        if leftovers:
+            cmds.delete(leftovers)
+
+        merged[sg] = result
+    return merged
+
+
+def shading_engines(roots):
+    """roots 아래 메쉬가 쓰는 SG 목록"""
+    shapes = cmds.ls(roots, dag=True, type="mesh", noIntermediate=True, long=True) or []
+    if not shapes:
+        return []
+    return sorted(set(cmds.listConnections(shapes, type="shadingEngine") or []))
+
+
+def remove_unused_shading(sgs=None):
+    """멤버 없는 SG, SG에 연결되지 않은 재질 삭제
+
+    sgs 를 주면 그 SG 와 거기 연결된 재질만 확인 (씬의 다른 셰이더는 그대로)
+    """
+    deleted = []
+
+    for sg in (cmds.ls(type="shadingEngine") or []) if sgs is None else sgs:
+        if sg in DEFAULT_NODES or not cmds.objExists(sg) or cmds.sets(sg, q=True):
+            continue
+        shaders = cmds.listConnections(sg + ".surfaceShader", source=True) or []
+        cmds.delete(sg)
+        deleted.append(sg)
+        for sh in shaders:
+            if cmds.objExists(sh) and not cmds.listConnections(sh, type="shadingEngine"):
+                cmds.delete(sh)
+                deleted.append(sh)
+
+    if sgs is not None:
+        return deleted
+
+    for mat in cmds.ls(materials=True) or []:
+        if mat in DEFAULT_NODES or not cmds.objExists(mat):
+            continue
+        if not cmds.listConnections(mat, type="shadingEngine"):
+            cmds.delete(mat)
+            deleted.append(mat)
+
+    return deleted
+
+
+def optimize_scene(roots=None, merge=True):
+    """history 삭제 → 정적 메쉬 병합 → 셰이딩 정리, 전/후 통계 출력"""
+    before = scene_stats()
+
+    cleaned = delete_history(roots)
+    merged = merge_static_meshes(roots) if merge else {}
+    removed = remove_unused_shading()
+
+    after = scene_stats()
+    print(f"history deleted on {len(cleaned)} meshes, "
+          f"{len(merged)} merged groups, {len(removed)} shading nodes removed")
+    print_stats(before, after)
+    return before, after
+
+
+if __name__ == "__main__":
+    optimize_scene()
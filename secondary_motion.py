@@ -0,0 +1,100 @@
+import maya.cmds as cmds
+import numpy as np
+
+from anim_batch import sample_channels, write_keys
+
+#  이동 경로에서 자동으로 계산하는 2차 모션
+#  - heading(rotateY): 수평 속도 방향
+#  - pitch(rotateZ): 상승률 (수평 속도 대비 수직 속도, 느리게 움직일 땐 0 쪽으로)
+#  - bank(rotateX): 선회 시 곡률 × 속도 (안쪽으로 기울기)
+#  전부 translate 커브를 프레임 단위로 한 번 샘플링 → numpy 유한차분 + 스무딩 → 키로 일괄 기록
+#  (차량 정면은 +X, 위는 +Y 기준 / HoverCar, flyingTaxi 모두 동일)
+
+ROTATE_ORDER_XZY = 3   # bank(X) → pitch(Z) → heading(Y) 순서로 적용
+FPS = {"game": 15, "film": 24, "pal": 25, "ntsc": 30, "show": 48}
+
+
+def smooth(a, window):
+    """이동 평균 (양 끝은 가장자리 값으로 패딩), a: (N, ...) 배열"""
+    if window <= 1:
+        return a
+    pad = window // 2
+    padded = np.concatenate([np.repeat(a[:1], pad, axis=0), a,
+                             np.repeat(a[-1:], window - 1 - pad, axis=0)])
+    kernel = np.ones(window) / window
+    return np.apply_along_axis(lambda c: np.convolve(c, kernel, mode="valid"), 0, padded)
+
+
+def _hold_invalid(angle, valid, fallback):
+    """정지 구간(valid=False)은 직전 유효 값 유지, 맨 앞은 첫 유효 값 사용
+
+    한 번도 움직이지 않는 열은 fallback 값으로 채운다.
+    """
+    steps = np.arange(len(angle)).reshape((-1,) + (1,) * (angle.ndim - 1))
+    idx = np.maximum.accumulate(np.where(valid, steps, 0), axis=0)
+    idx = np.maximum(idx, np.argmax(valid, axis=0))
+    held = np.take_along_axis(angle, idx, axis=0)
+    return np.where(valid.any(axis=0), held, fallback)
+
+
+def derive_orientation(pos, fps=24.0, window=9, bank_gain=0.35, max_bank=35.0,
+                       pitch_gain=1.0, max_pitch=25.0, min_speed=1e-3, pitch_speed=2.0,
+                       fallback_heading=0.0):
+    """pos: (frames, 3) 위치 → (frames, 3) [bank, heading, pitch] (degree)
+
+    여러 차량을 한 번에 계산하려면 pos 를 (frames, vehicles, 3) 로 넘기면 된다.
+    fallback_heading: 한 번도 수평 이동이 없을 때 쓸 heading (차량별 배열 가능)
+    pitch_speed: 수평 속도(units/s)가 이보다 느리면 pitch 를 0 쪽으로 비례해서 줄임
+    """
+    pos = smooth(np.asarray(pos, dtype=float), window)
+    vel = np.gradient(pos, axis=0) * fps                 # units / sec
+    vx, vy, vz = vel[..., 0], vel[..., 1], vel[..., 2]
+    horiz = np.hypot(vx, vz)
+    moving = horiz > min_speed
+
+    heading = _hold_invalid(np.arctan2(-vz, vx), moving, np.radians(fallback_heading))
+    heading = smooth(np.unwrap(heading, axis=0), window)
+
+    # 선회 각속도 × 속도 = 횡가속도 → 안쪽(왼쪽 선회면 -X 회전)으로 기울기
+    yaw_rate = np.gradient(heading, axis=0) * fps
+    bank = -np.degrees(np.arctan(bank_gain * horiz * yaw_rate / 9.8))
+    bank = np.clip(smooth(bank, window), -max_bank, max_bank)
+
+    # 제자리 호버(수평 속도 0)에서는 arctan2 가 ±90° 로 튀므로 수평 속도로 페이드
+    fade = np.clip(horiz / pitch_speed, 0.0, 1.0) * moving
+    pitch = np.degrees(np.arctan2(vy, np.maximum(horiz, min_speed))) * pitch_gain * fade
+    pitch = np.clip(smooth(pitch, window), -max_pitch, max_pitch)
+
+    return np.stack([bank, np.degrees(heading), pitch], axis=-1)
+
+
+def apply_secondary_motion(vehicles, start=1, end=600, step=4, **kwargs):
+    """차량 목록 전체에 heading/bank/pitch 키를 한 번에 생성
+
+    translate 는 프레임 단위로 샘플링하고, 키는 step 프레임마다 찍는다.
+    """
+    frames = np.arange(start, end + 1)
+    fps = float(FPS.get(cmds.currentUnit(q=True, time=True), 24))
+
+    # (frames, vehicles, 3) 로 모아서 한 번에 계산
+    pos = np.stack([sample_channels(v, ["translateX", "translateY", "translateZ"], frames)
+                    for v in vehicles], axis=1)
+    # 제자리 호버만 하는 차량은 원래 방향 유지
+    fallback = np.array([cmds.getAttr(v + ".rotateY") for v in vehicles])
+    rot = derive_orientation(pos, fps=fps, fallback_heading=fallback, **kwargs)
+
+    keep = np.r_[np.arange(0, len(frames), step), len(frames) - 1]
+    keep = np.unique(keep)
+    times = frames[keep]
+
+    for i, v in enumerate(vehicles):
+        cmds.setAttr(v + ".rotateOrder", ROTATE_ORDER_XZY)
+        write_keys(v, "rotateX", times, rot[keep, i, 0])
+        write_keys(v, "rotateY", times, rot[keep, i, 1])
+        write_keys(v, "rotateZ", times, rot[keep, i, 2])
+
+    return rot
+
+
+if __name__ == "__main__":
+    apply_secondary_motion(["HoverCar_1", "HoverCar_2", "HoverCar_3", "flyingTaxi_grp"])
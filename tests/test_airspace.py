@@ -0,0 +1,89 @@
+import math
+import os
+import sys
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import airspace
+
+#  순수 파이썬 경로 계획 확인 (Maya 없이 from_boxes 로 맵 구성)
+#  - 건물 두 채 사이에 좁은 틈, 가운데 벽 하나 (경로가 돌아가야 함)
+BOXES = [(-12, 0, -12, -4, 20, -2),
+         (-2, 0, -12, 6, 20, -2),
+         (-1, 0, 2, 1, 20, 14)]
+PORTS = [(-16, 0, 8), (10, 0, 8), (0, 0, -16), (8, 0, 18)]
+
+
+def _planner():
+    amap = airspace.AirspaceMap.from_boxes(BOXES, cell=1.0, margin=0.5, pad=6.0)
+    return airspace.RoutePlanner(amap, layers=(6.0, 10.0))
+
+
+def _cost(cells):
+    return sum(math.dist(a, b) for a, b in zip(cells, cells[1:]))
+
+
+def _assert_clear(planner, wps):
+    amap = planner.map
+    for a, b in zip(wps, wps[1:]):
+        if (a[0], a[2]) == (b[0], b[2]):
+            ix, iz = amap.cell_of(a)
+            assert amap.column_clear(ix, iz, a[1], b[1])
+            continue
+        grid = planner.blocked[a[1]]
+        n = int(math.dist(a, b) / amap.cell * 8) + 2
+        for t in np.linspace(0.0, 1.0, n):
+            p = (a[0] + (b[0] - a[0]) * t, a[2] + (b[2] - a[2]) * t)
+            assert not grid[amap.cell_of(p)], (a, b, p)
+
+
+def test_routes_are_collision_free():
+    planner = _planner()
+    planner.precompute(PORTS)
+    for alt in planner.layers:
+        for a in PORTS:
+            for b in PORTS:
+                if a != b:
+                    _assert_clear(planner, planner.route(a, b, alt))
+
+
+def test_flow_field_matches_astar():
+    planner = _planner()
+    alt = planner.layers[0]
+    for goal in PORTS:
+        g = planner.map.cell_of(goal)
+        for start in PORTS:
+            s = planner.map.cell_of(start)
+            cells = planner.astar(alt, s, g)
+            down = planner._descend(alt, s, g)
+            assert down[0] == s and down[-1] == g
+            assert _cost(down) == pytest.approx(_cost(cells))
+            assert _cost(cells) == pytest.approx(planner.distance_field(alt, g)[s])
+
+
+def test_blocked_and_outside_points_raise():
+    planner = _planner()
+    with pytest.raises(ValueError):
+        planner.route((0, 0, 8), PORTS[0], 6.0)       # 벽 안
+    with pytest.raises(ValueError):
+        planner.route(PORTS[0], (500, 0, 0), 6.0)     # 맵 밖
+
+
+def test_face_boxes_keep_gap_between_merged_shells():
+    # 합친 메쉬 하나에 떨어진 두 상자 → 면 단위 박스면 사이 공간이 비어 있어야 함
+    cube = np.array([(x, y, z) for x in (0, 2) for y in (0, 10) for z in (0, 2)], float)
+    quads = [(0, 1, 3, 2), (4, 6, 7, 5), (0, 4, 5, 1), (2, 3, 7, 6), (0, 2, 6, 4), (1, 5, 7, 3)]
+    points = np.vstack([cube, cube + (20, 0, 0)])
+    counts = [4] * 12
+    indices = [i for q in quads for i in q] + [i + 8 for q in quads for i in q]
+
+    boxes = airspace.face_boxes(points, counts, indices)
+    assert boxes.shape == (12, 6)
+    amap = airspace.AirspaceMap.from_boxes(boxes, cell=1.0, margin=0.5, pad=2.0)
+    layer = amap.layer(6.0)
+    assert layer[amap.cell_of((1, 1))] and layer[amap.cell_of((21, 1))]
+    assert not layer[amap.cell_of((11, 1))]
@@ -0,0 +1,162 @@
+import os
+import sys
+import json
+import time
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import job_server
+
+#  Maya 없이 잡 서버 확인: 가짜 cmds backend + 가짜 scene/프로토타입 빌더
+#  - 빈 포트로 서버를 띄우고 같은 스펙을 동시에 보내면 한 번만 빌드되는지
+#  - 결과 .mb / .json 이 out_dir 에 써지는지
+
+
+class FakeCmds(object):
+    """job_server 가 쓰는 cmds 함수만 흉내 (파일 저장은 실제 파일을 씀)"""
+
+    def __init__(self):
+        self.nodes = {}
+        self.scene = None
+        self.selection = []
+        self.calls = []
+
+    def _new(self, name):
+        n, i = name, 1
+        while n in self.nodes:
+            i += 1
+            n = f"{name}{i}"
+        self.nodes[n] = {}
+        return n
+
+    def objExists(self, name):
+        return name in self.nodes
+
+    def group(self, em=True, name="group"):
+        self.calls.append(("group", name))
+        return self._new(name)
+
+    def instance(self, node, name="instance"):
+        return [self._new(name)]
+
+    def setAttr(self, plug, *values, **kwargs):
+        node, attr = plug.split(".", 1)
+        self.nodes[node][attr] = values
+
+    def xform(self, node, **kwargs):
+        self.nodes[node]["xform"] = kwargs
+
+    def parent(self, node, parent):
+        return [node]
+
+    def select(self, nodes, replace=True):
+        self.selection = list(nodes)
+
+    def delete(self, nodes):
+        for n in nodes:
+            self.nodes.pop(n, None)
+
+    def file(self, path=None, **kwargs):
+        if kwargs.get("new"):
+            self.nodes.clear()
+        elif "rename" in kwargs:
+            self.scene = kwargs["rename"]
+        elif kwargs.get("save"):
+            self._write(self.scene, sorted(self.nodes))
+        elif kwargs.get("exportSelected"):
+            self._write(path, self.selection)
+
+    def _write(self, path, nodes):
+        with open(path, "w") as f:
+            f.write("\n".join(nodes))
+
+
+def _scene(server, spec):
+    server.cmds.file(new=True, force=True)
+    server.cmds.group(em=True, name=f"City_{spec.get('seed', 7)}_grp")
+    return None
+
+
+def _server(tmp_path):
+    backend = FakeCmds()
+    built = []
+
+    def proto():
+        built.append("hovercar")
+        return backend.group(em=True, name="Proto_HoverCar")
+
+    server = job_server.JobServer(str(tmp_path / "out"), port=0, backend=backend,
+                                  builders={"scene": _scene},
+                                  prototypes={"hovercar": proto})
+    return server, backend, built
+
+
+def _pump(server, done, timeout=10.0):
+    """메인 스레드 역할: 잡이 들어오면 process (serve_forever 와 같은 흐름)"""
+    end = time.time() + timeout
+    while not done() and time.time() < end:
+        if server.wakeup.wait(0.05):
+            server.process()
+    assert done()
+
+
+def test_identical_specs_are_coalesced_over_the_socket(tmp_path):
+    server, backend, built = _server(tmp_path)
+    server.start()
+    try:
+        spec = {"type": "fleet", "vehicle": "hovercar", "count": 4, "wait": True}
+        replies = []
+        threads = [threading.Thread(target=lambda: replies.append(
+            job_server.request(spec, port=server.port, timeout=10))) for _ in range(3)]
+        for t in threads:
+            t.start()
+        _pump(server, lambda: len(replies) == 3)
+        for t in threads:
+            t.join()
+    finally:
+        server.stop()
+
+    assert {r["status"] for r in replies} == {"done"}
+    assert len({r["id"] for r in replies}) == 1
+    assert len({r["out"] for r in replies}) == 1
+    # 빌드는 한 번: fleet 그룹 하나, 프로토타입 하나
+    assert [c for c in backend.calls if c[1].startswith("Fleet_")] == \
+        [("group", "Fleet_hovercar_grp")]
+    assert built == ["hovercar"]
+
+    out = replies[0]["out"]
+    assert os.path.exists(out) and out.endswith(".mb")
+    with open(os.path.splitext(out)[0] + ".json") as f:
+        meta = json.load(f)
+    assert meta["status"] == "done"
+    assert meta["spec"]["count"] == 4
+    with open(out) as f:
+        assert f.read() == "Fleet_hovercar_grp"
+
+
+def test_pending_duplicates_share_one_job(tmp_path):
+    server, backend, _ = _server(tmp_path)
+    a = server.submit({"type": "scene", "seed": 3})
+    b = server.submit({"type": "scene", "seed": 3, "wait": True})
+    c = server.submit({"type": "scene", "seed": 4})
+    assert a is b and a is not c
+    assert server.process() == 2
+
+    for job in (a, c):
+        assert job.status == "done", job.error
+        assert os.path.exists(job.out)
+        assert os.path.exists(os.path.splitext(job.out)[0] + ".json")
+    with open(a.out) as f:
+        assert f.read() == "City_3_grp"
+    # 결과 파일이 남아 있으면 다시 빌드하지 않음
+    assert server.submit({"type": "scene", "seed": 3}) is a
+    assert server.process() == 0
+
+
+def test_unknown_job_type_is_rejected(tmp_path):
+    server, _, _ = _server(tmp_path)
+    with pytest.raises(ValueError, match="render"):
+        server.submit({"type": "render"})
@@ -0,0 +1,89 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import render_scheduler
+
+#  렌더러 대신 파이썬 스텁 커맨드로 schedule 의 재시도 / 이어 붙이기 확인
+#  - chunk 1: 첫 시도는 종료 코드 3
+#  - chunk 2: 첫 시도는 마지막 프레임 파일이 빠짐 (종료 코드는 0)
+STUB = '''
+import os, sys
+start, end, out, chunk, marks = int(sys.argv[1]), int(sys.argv[2]), sys.argv[3], int(sys.argv[4]), sys.argv[5]
+mark = os.path.join(marks, "chunk%d" % chunk)
+first = not os.path.exists(mark)
+open(mark, "a").close()
+if first and chunk == 1:
+    sys.exit(3)
+last = end - 1 if first and chunk == 2 else end
+for f in range(start, last + 1):
+    with open(os.path.join(out, "img.%04d.png" % f), "w") as fh:
+        fh.write(str(f))
+'''
+
+
+def _template(tmp_path, stub=STUB):
+    script = tmp_path / "stub.py"
+    script.write_text(stub)
+    marks = tmp_path / "marks"
+    marks.mkdir()
+    return [sys.executable, str(script), "{start}", "{end}", "{out}", "{chunk}", str(marks)]
+
+
+def test_schedule_retries_and_stitches_in_order(tmp_path):
+    written, results = render_scheduler.schedule(
+        _template(tmp_path), "scene.mb", start=1, end=10, chunk_size=4, workers=3,
+        retries=2, work_dir=str(tmp_path / "chunks"), dest_dir=str(tmp_path / "out"))
+
+    attempts = {r["chunk"]: r["attempts"] for r in results}
+    assert attempts == {0: 1, 1: 2, 2: 2}
+    assert all(r["ok"] for r in results)
+
+    names = sorted(os.listdir(tmp_path / "out"))
+    assert names == [f"frame.{f:04d}.png" for f in range(1, 11)]
+    for f in range(1, 11):
+        assert (tmp_path / "out" / f"frame.{f:04d}.png").read_text() == str(f)
+    assert len(written) == 10
+    assert not (tmp_path / "chunks").exists()
+
+
+def test_schedule_raises_when_chunk_keeps_failing(tmp_path):
+    template = _template(tmp_path, "import sys\nsys.exit(1)\n")
+    with pytest.raises(RuntimeError):
+        render_scheduler.schedule(template, "scene.mb", start=1, end=4, chunk_size=2,
+                                  workers=2, retries=1, work_dir=str(tmp_path / "chunks"),
+                                  dest_dir=str(tmp_path / "out"))
+
+
+def test_missing_frames_fail_the_chunk(tmp_path):
+    script = tmp_path / "short.py"
+    script.write_text("import os, sys\nopen(os.path.join(sys.argv[1], 'a.png'), 'w').close()\n")
+    info = render_scheduler.run_chunk([sys.executable, str(script), "{out}"], 0, (1, 3),
+                                      "scene.mb", str(tmp_path / "c0"), retries=1)
+    assert not info["ok"]
+    assert info["attempts"] == 2
+    assert "1 files for 3 frames" in info["error"]
+
+
+def test_unpadded_frame_numbers_stitch_in_frame_order(tmp_path):
+    # Render 기본 extensionPadding=1 처럼 x.1, x.2 ... x.12 (사전순이면 1, 10, 11, 12, 2 ...)
+    script = tmp_path / "unpadded.py"
+    script.write_text(
+        "import os, sys\n"
+        "start, end, out = int(sys.argv[1]), int(sys.argv[2]), sys.argv[3]\n"
+        "for f in range(start, end + 1):\n"
+        "    with open(os.path.join(out, 'x.%d.png' % f), 'w') as fh:\n"
+        "        fh.write(str(f))\n")
+    template = [sys.executable, str(script), "{start}", "{end}", "{out}"]
+    render_scheduler.schedule(template, "scene.mb", start=1, end=12, chunk_size=12, workers=1,
+                              work_dir=str(tmp_path / "chunks"), dest_dir=str(tmp_path / "out"))
+    for f in range(1, 13):
+        assert (tmp_path / "out" / f"frame.{f:04d}.png").read_text() == str(f)
+
+
+def test_render_command_pads_frame_numbers():
+    cmd = render_scheduler.RENDER_CMD
+    assert cmd[cmd.index("-pad") + 1] == "4"
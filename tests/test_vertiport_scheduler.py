@@ -0,0 +1,74 @@
+import bisect
+import os
+import random
+import sys
+from collections import defaultdict
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import vertiport_scheduler as vs
+
+TURNAROUND = 40
+
+
+def _run(n=1500, window=20000, fleet=60, seed=7):
+    ports = vs.fi_ports()
+    flights = vs.fi_flights(n, window=window, fleet=fleet, rng=random.Random(seed))
+    return ports, flights, vs.schedule(flights, ports, turnaround=TURNAROUND)
+
+
+def test_every_flight_is_scheduled_without_conflicts():
+    ports, flights, slots = _run()
+    assert len(slots) == len(flights)
+    assert vs.check_conflicts(slots, ports) == 0
+    for s in slots:
+        assert s.takeoff >= s.flight.ready
+        assert s.landing >= s.takeoff + s.flight.duration
+
+
+def test_pad_capacity_and_separation():
+    ports, _, slots = _run()
+    ops = defaultdict(list)
+    for s in slots:
+        ops[s.flight.origin].append(s.takeoff)
+        ops[s.flight.dest].append(s.landing)
+    for name, times in ops.items():
+        port = ports[name]
+        times.sort()
+        assert all(b - a >= port.separation for a, b in zip(times, times[1:]))
+        # 패드 점유 구간 [t, t + occupancy) 이 동시에 pads 개를 넘지 않음
+        for k, t in enumerate(times):
+            busy = k + 1 - bisect.bisect_right(times, t - port.occupancy)
+            assert busy <= port.pads, (name, t)
+
+
+def test_vehicles_do_not_overlap_and_chain_ports():
+    _, _, slots = _run()
+    by_vehicle = defaultdict(list)
+    for s in slots:
+        by_vehicle[s.flight.vehicle].append(s)
+    for trips in by_vehicle.values():
+        trips.sort(key=lambda s: s.takeoff)
+        for prev, nxt in zip(trips, trips[1:]):
+            assert nxt.takeoff >= prev.landing + TURNAROUND
+            assert nxt.flight.origin == prev.flight.dest
+
+
+def test_flight_from_wrong_port_is_rejected():
+    ports = vs.fi_ports()
+    flights = [vs.Flight("UAM_0", "Vertiport_W", "Vertiport_E", 1, 500),
+               vs.Flight("UAM_0", "Vertiport_N", "Vertiport_S", 10, 599)]
+    with pytest.raises(ValueError):
+        vs.schedule(flights, ports)
+
+
+def test_check_conflicts_counts_violations():
+    ports = vs.fi_ports(pads=1, occupancy=30, separation=10)
+    a = vs.Flight("UAM_0", "Vertiport_W", "Vertiport_E", 1, 500)
+    b = vs.Flight("UAM_1", "Vertiport_W", "Vertiport_E", 1, 500)
+    # 같은 패드에서 5 프레임 차이로 이륙 → 간격 + 점유 위반 (출발/도착 양쪽)
+    slots = [vs.Slot(a, 1, 501, 0, 0), vs.Slot(b, 6, 506, 0, 0)]
+    assert vs.check_conflicts(slots, ports) == 4
+    assert vs.check_conflicts(vs.schedule([a, b], ports), ports) == 0
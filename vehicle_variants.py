@@ -0,0 +1,285 @@
+import fnmatch
+import numpy as np
+
+import maya.cmds as cmds
+import maya.api.OpenMaya as om
+
+#  같은 토폴로지 차량 변형 (비율 / 엔진 크기 / 패드 간격)
+#  - 차량 종류당 기본 메쉬(프로토타입)는 하나, 변형은 점 위치만 다름
+#  - 변형 축(target)마다 점 오프셋 배열을 한 번만 계산 (blendShape 타깃과 같은 개념)
+#  - 변형 하나 = target 가중치 벡터 몇 개 → 점 = base + Σ w * delta (numpy)
+#  - 씬에서도 지오메트리는 공유:
+#    · target 메쉬는 숨긴 라이브러리 그룹에 차량 종류당 한 벌만
+#    · 변형 차량은 프로토타입을 instanceLeaf 로 복제 → 변하지 않는 파츠는 shape 공유
+#    · 변하는 파츠만 출력 메쉬 하나 + blendShape (입력 = 프로토타입 shape, 타깃 = 라이브러리)
+#      → 변형마다 따로 저장되는 건 blendShape 가중치뿐 (출력 점은 평가 시 계산)
+
+WEIGHTS_ATTR = "variantWeights"
+LIB_SUFFIX = "_variantLib"
+
+
+#  target 규칙: (target 이름, 메쉬 이름 패턴, delta(points) → (n, 3))
+#  weight 1 일 때의 변화량. 메쉬 점은 오브젝트 공간.
+def _scale(axis, pivot, amount):
+    def delta(p):
+        d = np.zeros_like(p)
+        d[:, axis] = (p[:, axis] - pivot) * amount
+        return d
+    return delta
+
+
+def _scale_about(centers, amount, mask=None):
+    """centers(p) 기준 균등 스케일 (mask 밖의 점은 그대로)"""
+    def delta(p):
+        d = (p - centers(p)) * amount
+        if mask is not None:
+            d[~mask(p)] = 0.0
+        return d
+    return delta
+
+
+def _engine_center(p):
+    # mesh_builder.hovercar_parts: 엔진 축은 y=1.1, z=±1.25, 중심 x=0.3
+    return np.column_stack([np.full(len(p), 0.3), np.full(len(p), 1.1),
+                            np.sign(p[:, 2]) * 1.25])
+
+
+def _pad_spread(amount):
+    def delta(p):
+        d = np.zeros_like(p)
+        pads = p[:, 1] < 0.9                     # 패드(y=0.7) 만, 엔진 링(y=1.1) 제외
+        d[pads, 0] = np.sign(p[pads, 0]) * amount
+        d[pads, 2] = np.sign(p[pads, 2]) * amount
+        return d
+    return delta
+
+
+HOVERCAR_BODY = ("*_Hull_geo", "*_Glass_geo", "*_Seat_geo")
+HOVERCAR_TARGETS = [
+    ("length", HOVERCAR_BODY, _scale(0, 0.0, 0.3)),
+    ("height", HOVERCAR_BODY, _scale(1, 1.2, 0.3)),
+    ("width", HOVERCAR_BODY, _scale(2, 0.0, 0.25)),
+    ("engine", "*_Metal_geo", _scale_about(_engine_center, 0.5)),
+    ("engine", "*_Glow_geo", _scale_about(_engine_center, 0.5, mask=lambda p: p[:, 1] >= 0.9)),
+    ("pads", "*_Glow_geo", _pad_spread(0.4)),
+]
+
+TAXI_BODY = ("taxiBody_geo", "taxiRoof_geo", "taxiGlass_geo")
+TAXI_TARGETS = [
+    ("length", TAXI_BODY, _scale(0, 0.0, 0.25)),
+    ("height", TAXI_BODY, _scale(1, 0.0, 0.25)),
+    ("rotor", "rotor_*_geo", _scale_about(lambda p: np.zeros_like(p), 0.4)),
+]
+
+
+class VariantSet(object):
+    """차량 종류 하나: base 점 + target 오프셋 (모든 변형이 공유)
+
+    base[part] = (n, 3) float32, deltas[part] = (targets, n, 3) float32
+    """
+
+    def __init__(self, targets, base, deltas):
+        self.targets = targets
+        self.base = base
+        self.deltas = deltas
+        self.library = None         # build_library() 이후 {part: [(target 번호, 메쉬)]}
+
+    @classmethod
+    def from_scene(cls, root, rules):
+        base = {}
+        for part, dag in _meshes(root):
+            base[part] = _get_points(dag)
+
+        targets = []
+        for name, _, _ in rules:
+            if name not in targets:
+                targets.append(name)
+
+        deltas = {}
+        for part, p in base.items():
+            d = np.zeros((len(targets),) + p.shape, dtype=np.float32)
+            for name, pattern, fn in rules:
+                if _match(part, pattern):
+                    d[targets.index(name)] += fn(p.astype(float))
+            if d.any():
+                deltas[part] = d
+        return cls(targets, base, deltas)
+
+    def points(self, weights):
+        """가중치 → {part: (n, 3)} (target 없는 파츠는 빠짐)"""
+        w = np.asarray(weights, dtype=np.float32)
+        return {part: self.base[part] + np.tensordot(w, d, axes=1)
+                for part, d in self.deltas.items()}
+
+    def random_weights(self, n, rng=None, spread=1.0):
+        """(n, targets) 가중치, 각 target 은 [-spread, spread] 균등"""
+        rng = rng or np.random.default_rng()
+        return rng.uniform(-spread, spread, (n, len(self.targets))).astype(np.float32)
+
+    def build_library(self, proto):
+        """target 메쉬(base + delta)를 숨긴 그룹에 한 번만 생성 → {part: [(target 번호, 메쉬)]}"""
+        lib = proto.split("|")[-1] + LIB_SUFFIX
+        if cmds.objExists(lib):
+            cmds.delete(lib)
+        lib = cmds.group(em=True, name=lib)
+        cmds.setAttr(lib + ".visibility", 0)
+
+        xforms = {part: _transform(dag) for part, dag in _meshes(proto)}
+        library = {}
+        for part, d in self.deltas.items():
+            items = []
+            for t, target in enumerate(self.targets):
+                if not d[t].any():
+                    continue
+                mesh = cmds.duplicate(xforms[part], name=f"{part}_{target}_target")[0]
+                mesh = cmds.parent(mesh, lib)[0]
+                dag = _meshes(mesh)[0][1]
+                _set_points(dag, self.base[part] + d[t])
+                items.append((t, mesh))
+            library[part] = items
+        self.library = library
+        return lib
+
+
+def _match(part, pattern):
+    patterns = (pattern,) if isinstance(pattern, str) else pattern
+    return any(fnmatch.fnmatch(part, p) for p in patterns)
+
+
+def _meshes(root):
+    """root 아래 메쉬 → [(트랜스폼 짧은 이름, MDagPath)]"""
+    out = []
+    for shape in cmds.listRelatives(root, allDescendents=True, type="mesh", fullPath=True) or []:
+        if cmds.getAttr(shape + ".intermediateObject"):
+            continue
+        sel = om.MSelectionList()
+        sel.add(shape)
+        dag = sel.getDagPath(0)
+        xform = cmds.listRelatives(shape, parent=True)[0].split("|")[-1]
+        out.append((xform, dag))
+    return out
+
+
+def _transform(dag):
+    return cmds.listRelatives(dag.fullPathName(), parent=True, fullPath=True)[0]
+
+
+def _get_points(dag):
+    pts = om.MFnMesh(dag).getPoints(om.MSpace.kObject)
+    return np.array([(p.x, p.y, p.z) for p in pts], dtype=np.float32)
+
+
+def _set_points(dag, points):
+    om.MFnMesh(dag).setPoints(om.MPointArray(points.tolist()), om.MSpace.kObject)
+
+
+def _blend_shapes(root):
+    """root 아래 변형 파츠 → {part: blendShape}"""
+    out = {}
+    for part, dag in _meshes(root):
+        hist = cmds.ls(cmds.listHistory(dag.fullPathName()) or [], type="blendShape")
+        if hist:
+            out[part] = hist[0]
+    return out
+
+
+def attach_variant(root, proto, vset, name):
+    """instanceLeaf 복제본(root)에서 변형 파츠의 공유 shape 를 출력 메쉬 + blendShape 로 교체"""
+    base = {part: dag.fullPathName() for part, dag in _meshes(proto)}
+    for part, dag in _meshes(root):
+        items = vset.library.get(part)
+        if not items:
+            continue                            # 변하지 않는 파츠는 프로토타입 shape 그대로 공유
+        shared = dag.fullPathName()
+        xform = _transform(dag)
+        sgs = sorted(set(cmds.listConnections(base[part], type="shadingEngine") or []))
+
+        # 출력 메쉬: 자기 점 데이터 없이 프로토타입 shape 를 입력으로
+        out = cmds.createNode("mesh", name=f"{name}_{part}Shape", parent=xform)
+        cmds.connectAttr(base[part] + ".outMesh", out + ".inMesh")
+        cmds.parent(shared, removeObject=True, shape=True)
+        if sgs:
+            cmds.sets(out, e=True, forceElement=sgs[0])
+        cmds.blendShape(*[mesh for _, mesh in items] + [out],
+                        name=f"{name}_{part}_bs", origin="local")
+
+
+def apply_variant(root, vset, weights):
+    """root 의 blendShape 가중치를 변형 가중치로 설정, 가중치는 root 에도 기록"""
+    for part, bs in _blend_shapes(root).items():
+        for k, (t, _) in enumerate(vset.library[part]):
+            cmds.setAttr(f"{bs}.weight[{k}]", float(weights[t]))
+
+    if not cmds.attributeQuery(WEIGHTS_ATTR, node=root, exists=True):
+        cmds.addAttr(root, ln=WEIGHTS_ATTR, dt="doubleArray")
+    cmds.setAttr(f"{root}.{WEIGHTS_ATTR}", [float(w) for w in weights], type="doubleArray")
+
+
+def create_variants(proto, vset, weights, prefix="Variant", spacing=6.0):
+    """프로토타입을 instanceLeaf 로 복제해서 weights (n, targets) 만큼 변형 차량 생성 → 루트 리스트"""
+    if vset.library is None:
+        vset.build_library(proto)
+    roots = []
+    per_row = max(1, int(len(weights) ** 0.5 + 0.999))
+    for i, w in enumerate(weights):
+        name = f"{prefix}_{i + 1}"
+        root = cmds.duplicate(proto, name=name, instanceLeaf=True)[0]
+        attach_variant(root, proto, vset, name)
+        apply_variant(root, vset, w)
+        cmds.setAttr(root + ".visibility", 1)
+        cmds.xform(root, ws=True, t=((i % per_row) * spacing, 0, (i // per_row) * spacing))
+        roots.append(root)
+    return roots
+
+
+def heap_mb():
+    try:
+        return cmds.memory(heapMemory=True, megaByte=True)
+    except RuntimeError:
+        return 0.0
+
+
+def measure_memory(proto, vset, weights, prefix="Variant"):
+    """변형 차량 생성 전/후 Maya 힙 증가량 (MB) — 공유 방식 vs 프로토타입 전체 복제
+
+    두 경우 모두 한 번 평가(dgeval)까지 한 뒤 측정, 복제본은 측정 후 지움
+    """
+    def grow(make):
+        cmds.flushUndo()
+        before = heap_mb()
+        roots = make()
+        cmds.dgeval(cmds.ls(roots, dag=True, type="mesh") or [])
+        return roots, heap_mb() - before
+
+    copies, full = grow(lambda: [cmds.duplicate(proto, name=f"{prefix}Copy_{i + 1}")[0]
+                                 for i in range(len(weights))])
+    cmds.delete(copies)
+    roots, shared = grow(lambda: create_variants(proto, vset, weights, prefix))
+    return roots, shared, full
+
+
+#  차량 종류별 기본 프로토타입 + VariantSet
+def hovercar_variants(name="VariantProto_HoverCar"):
+    from mesh_builder import create_hovercar_fast
+
+    proto = create_hovercar_fast(name)[0]
+    cmds.setAttr(proto + ".visibility", 0)
+    return proto, VariantSet.from_scene(proto, HOVERCAR_TARGETS)
+
+
+def taxi_variants():
+    import FI
+
+    proto = FI.create_flying_taxi()
+    cmds.setAttr(proto + ".visibility", 0)
+    return proto, VariantSet.from_scene(proto, TAXI_TARGETS)
+
+
+if __name__ == "__main__":
+    rng = np.random.default_rng(7)
+    for label, make in (("hovercar", hovercar_variants), ("taxi", taxi_variants)):
+        proto, vset = make()
+        weights = vset.random_weights(100, rng)
+        _, shared, full = measure_memory(proto, vset, weights, prefix=f"{label}Variant")
+        print(f"{label}: {len(weights)} variants, targets {vset.targets}, "
+              f"heap +{shared:.1f} MB shared vs +{full:.1f} MB as full duplicates")
@@ -0,0 +1,295 @@
+import heapq
+import random
+from collections import defaultdict
+
+#  버티포트 이착륙 슬롯 스케줄러
+#  - 고정 프레임(start=1, 100, offset=20/40) 대신 비행마다 이륙/착륙 슬롯을 배정
+#  - 버티포트마다 패드 수(capacity), 패드 점유 시간, 연속 이착륙 최소 간격을 지킴
+#  - 이륙 요청/착륙을 하나의 이벤트 큐(heapq)로 시간 순 처리, 패드는 포트별 힙 → O(n log n)
+#  - 패드가 안 비면 이륙은 지상에서 미루고, 착륙은 비는 프레임까지 공중 대기
+#  - 같은 차량은 착륙 + turnaround 이후에만 다음 비행, 다음 비행은 직전 도착 포트에서 출발
+#  - 결과 슬롯 → FI.py 경로/택시 키 함수의 start/end/offset 으로 그대로 사용
+
+
+class Vertiport(object):
+    def __init__(self, name, pads=2, occupancy=30, separation=10):
+        self.name = name
+        self.pads = pads                # 동시에 쓸 수 있는 패드 수
+        self.occupancy = occupancy      # 이착륙 한 번에 패드를 쓰는 프레임
+        self.separation = separation    # 같은 포트 연속 이착륙 최소 간격 (프레임)
+
+
+class Flight(object):
+    def __init__(self, vehicle, origin, dest, ready, duration, route="A"):
+        self.vehicle = vehicle
+        self.origin = origin
+        self.dest = dest
+        self.ready = ready              # 가장 빨리 뜰 수 있는 프레임
+        self.duration = duration        # 비행 프레임 (이륙 → 착륙)
+        self.route = route              # FI.UAM_PATHS 키 또는 "taxi"
+
+
+class Slot(object):
+    def __init__(self, flight, takeoff, landing, pad_out, pad_in):
+        self.flight = flight
+        self.takeoff = takeoff
+        self.landing = landing
+        self.pad_out = pad_out
+        self.pad_in = pad_in
+
+    @property
+    def delay(self):
+        return self.takeoff - self.flight.ready
+
+    @property
+    def hold(self):
+        """공중 대기 프레임"""
+        return self.landing - self.takeoff - self.flight.duration
+
+
+class _PortState(object):
+    def __init__(self, port):
+        self.port = port
+        self.free = [(0, i) for i in range(port.pads)]    # (비는 프레임, 패드 번호)
+        self.last = None
+        self.landing = []       # 도착해서 대기 중 (도착 프레임 힙)
+        self.departing = []     # 이륙 대기 (준비 프레임 힙)
+        self.wake = None        # 예약된 처리 이벤트 프레임
+
+    def earliest(self):
+        t = self.free[0][0]
+        if self.last is not None:
+            t = max(t, self.last + self.port.separation)
+        return t
+
+    def book(self, t):
+        _, pad = heapq.heappop(self.free)
+        heapq.heappush(self.free, (t + self.port.occupancy, pad))
+        self.last = t
+        return pad
+
+
+READY, ARRIVE, WAKE = 0, 1, 2
+
+
+def schedule(flights, ports, turnaround=40):
+    """flights → [Slot] (착륙 순)
+
+    이벤트 큐 (프레임, 종류, 순번): 준비/도착 이벤트는 포트 대기열에 넣기만 하고,
+    포트 처리(WAKE) 이벤트가 패드가 비는 프레임마다 대기열 맨 앞 하나를 처리한다.
+    착륙 대기가 이륙 대기보다 우선. 포트 상태는 시간 순으로만 갱신된다.
+    ports: {name: Vertiport}, turnaround: 같은 차량 착륙 → 다음 이륙 최소 간격
+    차량별 비행은 (준비 프레임, 순번) 순으로 타고, 출발 포트가 직전 도착 포트와 달라야 하면 ValueError
+    """
+    state = {name: _PortState(p) for name, p in ports.items()}
+    at = {}
+    for ready, i, f in sorted((f.ready, i, f) for i, f in enumerate(flights)):
+        if f.origin not in state or f.dest not in state:
+            raise ValueError(f"{f.vehicle}: unknown vertiport '{f.origin}' / '{f.dest}'")
+        if at.get(f.vehicle, f.origin) != f.origin:
+            raise ValueError(f"{f.vehicle}: flight {i} departs '{f.origin}' "
+                             f"but the vehicle is at '{at[f.vehicle]}'")
+        at[f.vehicle] = f.dest
+
+    events = [(f.ready, READY, i, f) for i, f in enumerate(flights)]
+    heapq.heapify(events)
+    holder = {}                     # 차량 → 그 차량을 쓰는 비행 번호 (정비 중이면 None)
+    free_at = {}                    # 차량 → 다음 이륙 가능 프레임
+    later = defaultdict(list)       # 차량이 바쁠 때 들어온 다음 비행들 (준비 프레임 힙)
+    takeoffs = {}
+    slots = []
+
+    def wake(name, t):
+        st = state[name]
+        t = max(t, st.earliest())
+        if st.wake is None or t < st.wake:
+            st.wake = t
+            heapq.heappush(events, (t, WAKE, -1, name))
+
+    while events:
+        t, kind, i, item = heapq.heappop(events)
+
+        if kind == READY:
+            v = item.vehicle
+            if holder.get(v, i) not in (i, None):
+                heapq.heappush(later[v], (t, i, item))
+                continue
+            if free_at.get(v, t) > t:
+                heapq.heappush(events, (free_at[v], READY, i, item))
+                continue
+            holder[v] = i
+            heapq.heappush(state[item.origin].departing, (t, i, item))
+            wake(item.origin, t)
+
+        elif kind == ARRIVE:
+            heapq.heappush(state[item.dest].landing, (t, i, item))
+            wake(item.dest, t)
+
+        else:
+            st = state[item]
+            if st.wake != t:
+                continue                        # 더 이른 처리로 대체된 이벤트
+            st.wake = None
+            if st.earliest() > t:
+                wake(item, t)
+                continue
+
+            if st.landing:
+                _, j, f = heapq.heappop(st.landing)
+                takeoff, pad_out = takeoffs.pop(j)
+                slots.append(Slot(f, takeoff, t, pad_out, st.book(t)))
+                free_at[f.vehicle] = t + turnaround
+                holder[f.vehicle] = None
+                if later[f.vehicle]:
+                    ready, k, g = heapq.heappop(later[f.vehicle])
+                    holder[f.vehicle] = k
+                    heapq.heappush(events, (max(ready, t + turnaround), READY, k, g))
+            elif st.departing:
+                _, j, f = heapq.heappop(st.departing)
+                takeoffs[j] = (t, st.book(t))
+                heapq.heappush(events, (t + f.duration, ARRIVE, j, f))
+
+            if st.landing or st.departing:
+                wake(item, t)
+    return slots
+
+
+def check_conflicts(slots, ports):
+    """패드 중복 점유 / 최소 간격 위반 수 (0 이어야 정상)"""
+    ops = defaultdict(list)
+    for s in slots:
+        ops[s.flight.origin].append((s.takeoff, s.pad_out))
+        ops[s.flight.dest].append((s.landing, s.pad_in))
+
+    conflicts = 0
+    for name, events in ops.items():
+        port = ports[name]
+        events.sort()
+        last_on_pad = {}
+        for k, (t, pad) in enumerate(events):
+            if k and t - events[k - 1][0] < port.separation:
+                conflicts += 1
+            if pad in last_on_pad and t < last_on_pad[pad] + port.occupancy:
+                conflicts += 1
+            last_on_pad[pad] = t
+    return conflicts
+
+
+def print_report(slots):
+    if not slots:
+        return
+    delays = sorted(s.delay for s in slots)
+    print(f"{len(slots)} flights, last landing {max(s.landing for s in slots)}")
+    print(f"  ground delay avg {sum(delays) / len(delays):.1f} / "
+          f"p95 {delays[int(len(delays) * 0.95)]} / max {delays[-1]}")
+    print(f"  airborne hold total {sum(s.hold for s in slots)}")
+
+
+#  FI.py 연결
+#  경로별 출발/도착 버티포트와 비행 프레임 (FI.py 기본값: A 100→600, B/C 1→600, taxi 1→200)
+#  "<경로>_rev" 는 같은 경로를 거꾸로 (S 에서 나가는 경로가 없어서 C_rev 추가)
+REVERSED = "_rev"
+ROUTE_PORTS = {
+    "A": ("Vertiport_W", "Vertiport_E"),
+    "B": ("Vertiport_E", "Vertiport_W"),
+    "C": ("Vertiport_N", "Vertiport_S"),
+    "C_rev": ("Vertiport_S", "Vertiport_N"),
+    "taxi": ("Vertiport_W", "Vertiport_E"),
+}
+ROUTE_FRAMES = {"A": 500, "B": 599, "C": 599, "C_rev": 599, "taxi": 199}
+
+
+def fi_ports(pads=2, occupancy=30, separation=10):
+    names = sorted({p for pair in ROUTE_PORTS.values() for p in pair})
+    return {n: Vertiport(n, pads, occupancy, separation) for n in names}
+
+
+def fi_flights(n, window=2000, routes=("A", "B", "C", "C_rev", "taxi"), fleet=None,
+               rng=random):
+    """테스트용 비행 n 개 (window 프레임 안에서 무작위 준비 시각)
+
+    fleet 대의 차량이 돌아가며 타고, 차량마다 다음 비행은 직전 도착 포트에서 출발하는 경로
+    """
+    at = {}
+    flights = []
+    for i, ready in enumerate(sorted(rng.randint(1, window) for _ in range(n))):
+        vehicle = f"UAM_{i % fleet if fleet else i}"
+        choices = [r for r in routes if ROUTE_PORTS[r][0] == at.get(vehicle, ROUTE_PORTS[r][0])]
+        if not choices:
+            raise ValueError(f"{vehicle}: no route in {routes} departs from '{at[vehicle]}'")
+        route = rng.choice(choices)
+        origin, dest = ROUTE_PORTS[route]
+        at[vehicle] = dest
+        flights.append(Flight(vehicle, origin, dest, ready, ROUTE_FRAMES[route], route))
+    return flights
+
+
+def slot_keys(slot):
+    """슬롯 → FI.py 키 [(attr, frame, value)]"""
+    import FI
+
+    f = slot.flight
+    if f.route == "taxi":
+        # 택시 키는 1 프레임 기준 → offset 으로 이동, 공중 대기(hold)만큼 마지막 구간을 늘려
+        # 착륙 키가 배정된 착륙 슬롯에 오도록
+        return FI.taxi_keys(offset=slot.takeoff - 1, end=slot.landing)
+    if f.route.endswith(REVERSED):
+        # 계획 구간 [takeoff, takeoff + duration] 안에서 뒤집고, 공중 대기는 마지막 구간에
+        end = slot.takeoff + f.duration
+        keys = FI.uam_path_keys(f.route[:-len(REVERSED)], slot.takeoff, end)
+        return [(attr, slot.landing if fr == slot.takeoff else slot.takeoff + end - fr, v)
+                for attr, fr, v in keys]
+    return FI.uam_path_keys(f.route, slot.takeoff, slot.landing)
+
+
+def animate_schedule(slots):
+    """차량(트랜스폼)마다 슬롯 키를 모아서 채널별로 한 번에 기록
+
+    비행 사이(착륙 → 다음 이륙 직전)는 착륙 값을 한 번 더 키로 박아 패드에서 대기하게 함
+    (안 그러면 착륙 키와 다음 이륙 키 사이를 보간하며 다음 경로 쪽으로 미리 움직임)
+    """
+    from anim_batch import write_keys
+    import maya.cmds as cmds
+
+    curves = {}
+    spline = set()
+    holds = defaultdict(list)
+    last = {}
+    for s in sorted(slots, key=lambda s: s.takeoff):
+        v = s.flight.vehicle
+        keys = slot_keys(s)
+        prev = last.get(v)
+        if prev is not None and s.takeoff - 1 > prev.landing:
+            for attr, frame, value in slot_keys(prev):
+                if frame == prev.landing:
+                    curves[(v, attr)][s.takeoff - 1] = value
+                    holds[(v, attr)].append((prev.landing, s.takeoff - 1))
+        last[v] = s
+
+        for attr, frame, value in keys:
+            curves.setdefault((v, attr), {})[frame] = value
+            if s.flight.route == "taxi":
+                # FI.animate_taxi 는 spline 탄젠트, 경로 함수는 기본 탄젠트
+                spline.add((v, attr))
+
+    for (obj, attr), keys in curves.items():
+        times = sorted(keys)
+        tangent = "spline" if (obj, attr) in spline else None
+        write_keys(obj, attr, times, [keys[t] for t in times], tangent=tangent)
+        # 대기 구간 양 끝은 flat → 대기 중에 값이 튀지 않음
+        for t0, t1 in holds.get((obj, attr), []):
+            cmds.keyTangent(obj, at=attr, time=(t0, t1), itt="flat", ott="flat")
+    return curves
+
+
+if __name__ == "__main__":
+    import time
+
+    ports = fi_ports()
+    flights = fi_flights(5000, window=60000, fleet=400, rng=random.Random(7))
+
+    t0 = time.perf_counter()
+    slots = schedule(flights, ports)
+    print(f"scheduled in {time.perf_counter() - t0:.3f}s, "
+          f"conflicts {check_conflicts(slots, ports)}")
+    print_report(slots)
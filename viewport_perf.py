@@ -0,0 +1,171 @@
+import json
+import maya.cmds as cmds
+import maya.api.OpenMaya as om
+
+#  뷰포트 퍼포먼스 모드 (인터랙티브 재생용)
+#  - 반투명/발광 재질 → 불투명 lambert 프록시 (색만 유지)
+#  - 카메라(원점) 기준 먼 건물/소품 → 바운딩 박스 표시
+#  - ExtraSkyDome_geo 숨김
+#  - 원래 상태는 network 노드에 기록해 두고 끄면 그대로 복구 (렌더 전에 끄기)
+
+STATE_NODE = "ViewportPerf_state"
+SKY_DOME = "ExtraSkyDome_geo"
+
+# 멀리 있으면 박스로 보일 오브젝트
+FAR_PATTERNS = ["Building_*", "ExtraBuilding_*_geo", "ExtraBuilding_*_win_geo",
+                "Tree_*", "ExtraStreetLight*_grp"]
+
+
+def is_enabled():
+    return cmds.objExists(STATE_NODE)
+
+
+def _proxy_for(shader):
+    """원래 셰이더 색을 가진 불투명 lambert (셰이더당 하나)"""
+    proxy = shader + "_vpProxy"
+    if not cmds.objExists(proxy):
+        proxy = cmds.shadingNode("lambert", asShader=True, name=proxy)
+        if cmds.attributeQuery("color", node=shader, exists=True):
+            c = cmds.getAttr(shader + ".color")[0]
+            cmds.setAttr(proxy + ".color", c[0], c[1], c[2], type="double3")
+    return proxy
+
+
+def _needs_proxy(shader):
+    for attr in ("transparency", "incandescence"):
+        if cmds.attributeQuery(attr, node=shader, exists=True):
+            if max(cmds.getAttr(f"{shader}.{attr}")[0]) > 0.0:
+                return True
+    return False
+
+
+def _swap_materials(state):
+    for sg in cmds.ls(type="shadingEngine") or []:
+        src = cmds.listConnections(sg + ".surfaceShader", source=True,
+                                   destination=False, plugs=True) or []
+        if not src:
+            continue
+        shader = src[0].split(".")[0]
+        if not _needs_proxy(shader):
+            continue
+        proxy = _proxy_for(shader)
+        cmds.connectAttr(proxy + ".outColor", sg + ".surfaceShader", force=True)
+        state["shaders"][sg] = src[0]
+
+
+def _far_objects(center, distance):
+    # 패턴끼리 겹침 (ExtraBuilding_*_geo 가 *_win_geo 도 잡음) → 전체 경로 기준 순서 유지 중복 제거
+    objs = {}
+    for pat in FAR_PATTERNS:
+        for node in cmds.ls(pat, type="transform", long=True) or []:
+            if node in objs:
+                continue
+            bb = cmds.exactWorldBoundingBox(node)
+            cx, cz = (bb[0] + bb[3]) / 2, (bb[2] + bb[5]) / 2
+            if ((cx - center[0]) ** 2 + (cz - center[2]) ** 2) ** 0.5 > distance:
+                objs[node] = True
+    return list(objs)
+
+
+def enable(far_distance=15.0, center=None):
+    """퍼포먼스 모드 켜기 (이미 켜져 있으면 무시)"""
+    if is_enabled():
+        return
+
+    panel = cmds.getPanel(withFocus=True)
+    if center is None and panel in (cmds.getPanel(type="modelPanel") or []):
+        cam = cmds.modelPanel(panel, q=True, camera=True)
+        center = cmds.xform(cam, q=True, ws=True, t=True)
+    center = center or (0, 0, 0)
+
+    state = {"shaders": {}, "overrides": {}, "sky": None}
+
+    _swap_materials(state)
+
+    # 먼 오브젝트: drawing override 로 bounding box 표시
+    for node in _far_objects(center, far_distance):
+        if node in state["overrides"]:
+            continue                # 처음 본 값(원래 상태)만 기록
+        state["overrides"][node] = [cmds.getAttr(node + ".overrideEnabled"),
+                                    cmds.getAttr(node + ".overrideLevelOfDetail")]
+        cmds.setAttr(node + ".overrideEnabled", 1)
+        cmds.setAttr(node + ".overrideLevelOfDetail", 1)
+
+    if cmds.objExists(SKY_DOME):
+        state["sky"] = cmds.getAttr(SKY_DOME + ".visibility")
+        cmds.setAttr(SKY_DOME + ".visibility", 0)
+
+    node = cmds.createNode("network", name=STATE_NODE)
+    cmds.addAttr(node, ln="state", dt="string")
+    cmds.setAttr(node + ".state", json.dumps(state), type="string")
+
+
+def disable():
+    """원래 재질/표시 상태로 복구하고 프록시 삭제"""
+    if not is_enabled():
+        return
+
+    state = json.loads(cmds.getAttr(STATE_NODE + ".state"))
+
+    proxies = set()
+    for sg, plug in state["shaders"].items():
+        if cmds.objExists(sg) and cmds.objExists(plug):
+            cur = cmds.listConnections(sg + ".surfaceShader", source=True, destination=False) or []
+            proxies.update(cur)
+            cmds.connectAttr(plug, sg + ".surfaceShader", force=True)
+
+    for node, (enabled, lod) in state["overrides"].items():
+        if cmds.objExists(node):
+            cmds.setAttr(node + ".overrideLevelOfDetail", lod)
+            cmds.setAttr(node + ".overrideEnabled", enabled)
+
+    if state["sky"] is not None and cmds.objExists(SKY_DOME):
+        cmds.setAttr(SKY_DOME + ".visibility", state["sky"])
+
+    for p in proxies:
+        if p.endswith("_vpProxy") and cmds.objExists(p):
+            cmds.delete(p)
+    cmds.delete(STATE_NODE)
+
+
+def toggle(**kwargs):
+    if is_enabled():
+        disable()
+    else:
+        enable(**kwargs)
+    return is_enabled()
+
+
+_guard = {"ids": [], "was_on": False}
+
+
+def _before_save(*args):
+    _guard["was_on"] = is_enabled()
+    disable()
+
+
+def _after_save(*args):
+    if _guard["was_on"]:
+        enable()
+
+
+def install_render_guard():
+    """저장 파일과 렌더에는 항상 원래 재질이 들어가도록
+
+    - 씬 저장 직전에 끄고, 저장 후 다시 켬
+    - 렌더 시작(preMel) 시 끔
+    """
+    if not _guard["ids"]:
+        _guard["ids"] = [
+            om.MSceneMessage.addCallback(om.MSceneMessage.kBeforeSave, _before_save),
+            om.MSceneMessage.addCallback(om.MSceneMessage.kAfterSave, _after_save),
+        ]
+    guard = 'python("import viewport_perf; viewport_perf.disable()");'
+    pre = cmds.getAttr("defaultRenderGlobals.preMel") or ""
+    if guard not in pre:
+        cmds.setAttr("defaultRenderGlobals.preMel", guard + pre, type="string")
+
+
+if __name__ == "__main__":
+    install_render_guard()
+    print("performance mode:", "on" if toggle() else "off")